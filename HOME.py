@@ -1,5 +1,13 @@
 import streamlit as st
 
+from utils.admin import is_admin, render_admin
+from utils.assets import asset_source
+
+# /?admin=<token>: timings and cache stats instead of the home page
+if is_admin():
+    render_admin()
+    st.stop()
+
 
 
 
@@ -8,5 +16,5 @@ img = "https://github.com/MK316/english-phonetics/raw/main/pages/images/phonetic
 col1, col2, col3 = st.columns([0.5, 3, 0.5])
 with col2:
     st.markdown("### 🍎 English Phonetics (Spring 2026)")
-    st.image(img, use_container_width=True)  # or: width=400
+    st.image(asset_source(img), use_container_width=True)  # or: width=400
 
@@ -0,0 +1,162 @@
+"""Benchmarks for the pure text-processing and grading functions.
+
+Times ``utils.grading`` and ``utils.slides.natural_key`` on synthetic inputs
+of 10k-1M items and compares against ``benchmarks/baselines.json``::
+
+    python benchmarks/bench_grading.py                   # report vs baselines
+    python benchmarks/bench_grading.py --sizes 10000     # quick run
+    python benchmarks/bench_grading.py --check           # exit 1 on a regression
+    python benchmarks/bench_grading.py --update          # store this machine's numbers
+
+Figures are ns per item, best of ``--repeat`` runs.  ``--check`` fails when a
+case is more than ``TOLERANCE`` x its baseline; baselines are per machine, so
+refresh them with ``--update`` after moving to new hardware.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from utils import grading  # noqa: E402
+from utils.slides import natural_key  # noqa: E402
+
+BASELINE_FILE = Path(__file__).with_name("baselines.json")
+SIZES = (10_000, 100_000, 1_000_000)
+TOLERANCE = 1.5
+
+IPA = "ˈˌːæɑɒɔəɛɜɪʊʌŋθðʃʒʤʧɹɾlmnptkbdgɡfvszhwj"
+ANSWERS = [["soft palate", "velum"], ["tongue tip", "tip of the tongue"], ["alveolar ridge"],
+           ["front of the tongue", "tongue front"], ["uvula"]]
+FEATURES = ["Voicing", "Place", "Centrality", "Oro-nasal", "Manner"]
+OPTIONS = {"Voicing": ["voiceless", "voiced"], "Place": ["bilabial", "alveolar", "velar"],
+           "Centrality": ["central", "lateral"], "Oro-nasal": ["oral", "nasal"],
+           "Manner": ["stop", "fricative", "approximant"]}
+
+
+# ---------------- Synthetic inputs ----------------
+def _transcription(rng: random.Random) -> str:
+    core = "".join(rng.choice(IPA) for _ in range(rng.randint(3, 10)))
+    return rng.choice(["/{}/", "[{}]", " {} ", "{}"]).format(core)
+
+
+def _answer(rng: random.Random) -> str:
+    text = rng.choice(rng.choice(ANSWERS))
+    return rng.choice([text, text.upper(), text.replace(" ", "-"), text + "s", f"  {text}! "])
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz-' ’") for _ in range(rng.randint(3, 12)))
+
+
+def case_compare_transcription(n: int, rng: random.Random) -> Callable[[], object]:
+    pairs = [(_transcription(rng), _transcription(rng)) for _ in range(n)]
+    return lambda: [grading.compare_transcription(a, b) for a, b in pairs]
+
+
+def case_compare_word(n: int, rng: random.Random) -> Callable[[], object]:
+    pairs = [(_word(rng), _word(rng)) for _ in range(n)]
+    return lambda: [grading.compare_word(a, b) for a, b in pairs]
+
+
+def case_is_accepted(n: int, rng: random.Random) -> Callable[[], object]:
+    items = [(_answer(rng), rng.choice(ANSWERS)) for _ in range(n)]
+    return lambda: [grading.is_accepted(text, gold) for text, gold in items]
+
+
+def case_normalize_text(n: int, rng: random.Random) -> Callable[[], object]:
+    texts = [f"{_word(rng)}, {_word(rng)}." for _ in range(n)]
+    return lambda: [grading.normalize_text(t) for t in texts]
+
+
+def case_render_passage(n: int, rng: random.Random) -> Callable[[], object]:
+    passage = "".join(f"{_word(rng)} ____ " + ("\n" if rng.random() < 0.1 else "") for _ in range(n))
+    items = [["w"] * rng.randint(1, 3) for _ in range(n)]
+    return lambda: grading.render_passage_with_numbered_blanks(passage, items)
+
+
+def case_wrong_mask(n: int, rng: random.Random) -> Callable[[], object]:
+    def frame():
+        return pd.DataFrame([{"IPA": f"s{i}", **{f: rng.choice(OPTIONS[f]) for f in FEATURES}} for i in range(n)],
+                            columns=["IPA", *FEATURES])
+    user, ans = frame(), frame()
+    return lambda: grading.compute_wrong_mask_and_feedback(user, ans, FEATURES)
+
+
+def case_natural_key(n: int, rng: random.Random) -> Callable[[], object]:
+    names = [f"F25_Ch{rng.randint(1, 12):02d}.{rng.randint(1, 999)}.png" for _ in range(n)]
+    return lambda: sorted(names, key=natural_key)
+
+
+CASES: Dict[str, Callable[[int, random.Random], Callable[[], object]]] = {
+    "compare_transcription": case_compare_transcription,
+    "compare_word": case_compare_word,
+    "is_accepted": case_is_accepted,
+    "normalize_text": case_normalize_text,
+    "render_passage": case_render_passage,
+    "wrong_mask_feedback": case_wrong_mask,
+    "natural_key_sort": case_natural_key,
+}
+
+
+def measure(case: str, n: int, repeat: int, seed: int) -> float:
+    """Best ns per item over ``repeat`` runs."""
+    run = CASES[case](n, random.Random(seed))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e9 / n
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the grading and text-processing helpers.")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help=f"exit 1 if a case is over {TOLERANCE}x its baseline")
+    parser.add_argument("--update", action="store_true", help="write this run to the baselines")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.cases) - set(CASES))
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    try:
+        baselines = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        baselines = {}
+
+    slow: List[str] = []
+    print(f"{'case':<24}{'items':>10}{'ns/item':>11}{'baseline':>11}{'ratio':>8}")
+    for case in args.cases or list(CASES):
+        for n in args.sizes:
+            ns = measure(case, n, args.repeat, args.seed)
+            base = baselines.get(case, {}).get(str(n))
+            ratio = ns / base if base else None
+            flag = "  SLOWER" if ratio and ratio > TOLERANCE else ""
+            print(f"{case:<24}{n:>10,d}{ns:>11.0f}{base or '-':>11}"
+                  f"{f'{ratio:.2f}' if ratio else '-':>8}{flag}")
+            if flag:
+                slow.append(f"{case}@{n}")
+            if args.update:
+                baselines.setdefault(case, {})[str(n)] = round(ns)
+
+    if args.update:
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"wrote {BASELINE_FILE.name}")
+    if args.check and slow:
+        print(f"{len(slow)} case(s) slower than {TOLERANCE}x baseline: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Time-to-first-slide for the original PNGs vs the recompressed copies.
+
+Serves the checkout over a local HTTP server that emulates a client link
+(bandwidth + round-trip time), then for the first slides of every deck times
+fetching the file and decoding it, as a browser would before the first paint::
+
+    python -m utils.recompress --formats webp avif   # build the copies first
+    python benchmarks/bench_slides.py --mbps 20 --rtt-ms 40
+"""
+import argparse
+import functools
+import io
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.recompress import FULL_FORMATS, full_path  # noqa: E402
+from utils.slides import REPO_ROOT, deck_dirs, load_manifest  # noqa: E402
+
+
+class ThrottledHandler(SimpleHTTPRequestHandler):
+    mbps = 20.0
+    rtt_ms = 40.0
+    chunk = 16 * 1024
+
+    def log_message(self, *args):
+        pass
+
+    def copyfile(self, source, outputfile):
+        time.sleep(self.rtt_ms / 1000)
+        per_chunk = self.chunk * 8 / (self.mbps * 1e6)
+        while True:
+            buf = source.read(self.chunk)
+            if not buf:
+                break
+            outputfile.write(buf)
+            time.sleep(per_chunk)
+
+
+def first_slide(base: str, path: Path) -> float:
+    from PIL import Image
+
+    url = f"{base}/{path.relative_to(REPO_ROOT).as_posix()}"
+    t0 = time.perf_counter()
+    with urllib.request.urlopen(url) as r:
+        data = r.read()
+    Image.open(io.BytesIO(data)).load()
+    return time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mbps", type=float, default=20.0, help="emulated bandwidth (default 20)")
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="emulated round trip (default 40)")
+    parser.add_argument("--slides", type=int, default=3, help="first N slides of each deck")
+    args = parser.parse_args(argv)
+
+    ThrottledHandler.mbps, ThrottledHandler.rtt_ms = args.mbps, args.rtt_ms
+    handler = functools.partial(ThrottledHandler, directory=str(REPO_ROOT))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    results = {fmt: [] for fmt in ("original",) + FULL_FORMATS}
+    sizes = {fmt: 0 for fmt in results}
+    try:
+        for deck in deck_dirs():
+            folder_path = deck.relative_to(REPO_ROOT).as_posix()
+            for entry in load_manifest(folder_path)["slides"][:args.slides]:
+                candidates = {"original": deck / entry["name"]}
+                candidates.update({fmt: full_path(folder_path, entry["sha256"], fmt) for fmt in FULL_FORMATS})
+                for fmt, path in candidates.items():
+                    if path.exists():
+                        results[fmt].append(first_slide(base, path))
+                        sizes[fmt] += path.stat().st_size
+    finally:
+        server.shutdown()
+
+    print(f"time to first slide at {args.mbps:g} Mbit/s, {args.rtt_ms:g} ms RTT (fetch + decode)")
+    for fmt, times in results.items():
+        if not times:
+            print(f"  {fmt:<8} not built (python -m utils.recompress --formats {fmt})")
+            continue
+        ms = sorted(t * 1000 for t in times)
+        print(f"  {fmt:<8} n={len(ms):<3} avg {sizes[fmt] / len(ms) / 1024:6.0f} KB  "
+              f"median {statistics.median(ms):6.0f} ms  p90 {ms[int(0.9 * (len(ms) - 1))]:6.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Import-time report per page, with a budget check.
+
+Runs each page's module-level imports in a fresh interpreter under
+``python -X importtime`` and reports the best total of ``--runs`` runs (the
+least noisy figure) plus the heaviest top-level modules::
+
+    python benchmarks/import_time.py            # report
+    python benchmarks/import_time.py --check    # exit 1 if a page is over its budget
+    python benchmarks/import_time.py --update   # rewrite the budgets from this run
+
+Every page needs streamlit, so each run also times a bare ``import
+streamlit`` right before the page, and a page is measured as a multiple of
+that baseline.  Load on the machine slows both alike, so the ratio moves
+when a page gains imports, not when the machine is busy.  Budgets in
+``benchmarks/import_budget.json`` are such ratios; ``--update`` writes
+``HEADROOM`` x measured + ``SLACK``, enough to absorb noise but not a new
+top-level matplotlib or librosa.  Imports deferred with
+``utils.lazy.lazy_import`` do not count, which is the point.
+
+Pages whose imports are exactly one of ``SHARED_BUDGETS`` (the chapter slide
+players) share a single budget, set from the median ratio of every run of
+every such page, so that noise between identical pages does not become
+per-page limits.
+"""
+import argparse
+import ast
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BUDGET_FILE = Path(__file__).with_name("import_budget.json")
+PAGE_GLOBS = ("HOME.py", "pages/*.py", "pages/apps/*.py")
+BASELINE = ["import streamlit"]
+HEADROOM = 1.15
+SLACK = 0.1
+MARKER = "--- page imports ---"
+# budget name -> the exact module-level imports of the pages sharing it
+SHARED_BUDGETS = {
+    "slide-player pages": ["import streamlit as st", "from utils.slide_player import render_slide_player"],
+}
+
+
+def page_files() -> List[Path]:
+    return sorted({p for pattern in PAGE_GLOBS for p in REPO_ROOT.glob(pattern)})
+
+
+def import_statements(path: Path) -> List[str]:
+    """Source of the imports a page runs at module level."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    stmts = []
+    for node in tree.body:
+        candidates = node.body if isinstance(node, ast.Try) else [node]
+        stmts += [ast.unparse(n) for n in candidates if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return stmts
+
+
+def budget_key(rel: str, stmts: List[str]) -> str:
+    """Name of the budget ``rel`` is checked against: a shared one, or its own path."""
+    return next((name for name, imports in SHARED_BUDGETS.items() if stmts == imports), rel)
+
+
+def _script(stmts: List[str]) -> str:
+    lines = ["import sys", f"sys.stderr.write({MARKER!r} + '\\n'); sys.stderr.flush()"]
+    for stmt in stmts:
+        lines += ["try:", f"    {stmt}", "except Exception as e:", f"    print('FAILED', {stmt!r}, e)"]
+    return "\n".join(lines)
+
+
+def measure(stmts: List[str]) -> Tuple[float, Dict[str, float], List[str]]:
+    """(total ms, top-level module -> cumulative ms, failed imports) for one run."""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _script(stmts)],
+                          cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    _, _, report = proc.stderr.partition(MARKER)
+    modules: Dict[str, float] = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            modules[name.strip()] = int(cumulative) / 1000
+    failed = [line for line in proc.stdout.splitlines() if line.startswith("FAILED")]
+    return sum(modules.values()), modules, failed
+
+
+def _budget(ratio: float) -> float:
+    return math.ceil((ratio * HEADROOM + SLACK) * 100) / 100
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Per-page import-time report and budget check.")
+    parser.add_argument("pages", nargs="*", type=Path, help="page files (default: every page)")
+    parser.add_argument("--runs", type=int, default=3, help="runs per page; the fastest is reported")
+    parser.add_argument("--top", type=int, default=3, help="heaviest modules to list per page")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if a page exceeds its budget (x bare streamlit import)")
+    parser.add_argument("--update", action="store_true", help="write budgets from this run")
+    args = parser.parse_args(argv)
+
+    try:
+        budgets = json.loads(BUDGET_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        budgets = {}
+
+    over = 0
+    shared: Dict[str, List[float]] = {}  # shared budget -> per-run ratios of its pages
+    pages = [p.resolve() for p in args.pages] or page_files()
+    print(f"{'ms':>8} {'streamlit':>10} {'ratio':>6}  {'budget':<13} page")
+    for path in pages:
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        stmts = import_statements(path)
+        baselines, runs = [], []
+        for _ in range(args.runs):  # interleaved, so both see the same load
+            baselines.append(measure(BASELINE)[0])
+            runs.append(measure(stmts))
+        baseline = min(baselines)
+        total, modules, failed = min(runs, key=lambda r: r[0])
+        ratio = total / baseline if baseline else float("nan")
+        heavy = sorted(modules.items(), key=lambda kv: -kv[1])[:args.top]
+        key = budget_key(rel, stmts)
+        budget = budgets.get(key)
+        status = ""
+        if budget is not None:
+            status = f"{budget:.2f}x"
+            if ratio > budget:
+                status += "  OVER"
+                over += 1
+        print(f"{total:8.0f} {baseline:10.0f} {ratio:5.2f}x  {status:<13} {rel}")
+        print("           " + ", ".join(f"{name} {ms:.0f}" for name, ms in heavy))
+        if key != rel:
+            print(f"           budget shared by the {key}")
+        for line in failed:
+            print(f"           {line}")
+        if key != rel:
+            shared.setdefault(key, []).extend(r[0] / b for b, r in zip(baselines, runs) if b)
+            budgets.pop(rel, None)
+        elif args.update:
+            budgets[rel] = _budget(ratio)
+
+    for key, ratios in shared.items():
+        print(f"{key}: median {statistics.median(ratios):.2f}x over {len(ratios)} runs")
+        if args.update:
+            budgets[key] = _budget(statistics.median(ratios))
+
+    if args.update:
+        BUDGET_FILE.write_text(json.dumps(budgets, indent=1, ensure_ascii=False, sort_keys=True) + "\n",
+                               encoding="utf-8")
+        print(f"wrote {BUDGET_FILE.relative_to(REPO_ROOT)}")
+    if args.check and over:
+        print(f"{over} page(s) over their import-time budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
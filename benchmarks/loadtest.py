@@ -0,0 +1,344 @@
+"""Headless multi-session load test for the course pages.
+
+Drives N concurrent sessions with Streamlit's ``AppTest`` (one per thread,
+sharing the process-wide ``st.cache_data`` caches like a real server) through
+scripted flows, and reports per-step latency percentiles and peak RSS::
+
+    python benchmarks/loadtest.py                      # 8 sessions, every flow
+    python benchmarks/loadtest.py --sessions 32 --flows slides quiz
+    python benchmarks/loadtest.py --tts-ms 300 --json out.json
+    python benchmarks/loadtest.py --concurrent-open    # time first runs under load too
+
+Flows:
+
+* ``slides``: Chapter 2 with server-side navigation: next, previous, go to,
+  thumbnail.
+* ``transcription``: 22 Transcription, "New item" / "Check" in both tabs.
+* ``quiz``: term practice (Ch1), start the audio quiz and answer every item
+  until the report is built.
+
+Network services are stubbed: gTTS returns a fixed MP3 frame after
+``--tts-ms`` and remote fetches (``utils.http``) return local fixtures after
+``--net-ms``, so the numbers measure the app, not Google or GitHub.  The TTS
+clip cache starts empty in a temporary folder.  Section timings from
+``utils.timing`` go to a temporary log and are summarised too.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+os.environ.setdefault("PHONETICS_LOG_DIR", tempfile.mkdtemp(prefix="loadtest-logs-"))
+os.environ.setdefault("PHONETICS_TTS_DIR", tempfile.mkdtemp(prefix="loadtest-tts-"))  # stub clips stay out of .cache/
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from utils import http, timing  # noqa: E402
+
+PAGES = {
+    "slides": REPO_ROOT / "pages" / "20🔰_Chapter_2.py",
+    "transcription": REPO_ROOT / "pages" / "22〰️APP:_Transcription.py",
+    "quiz": REPO_ROOT / "pages" / "apps" / "term-practice-ch1.py",
+}
+RUN_TIMEOUT = 120
+OPEN_ATTEMPTS = 3
+SERIAL_OPEN = "open (serial)"  # step name while openings are serialized, see Session.open
+_open_lock = threading.Lock()
+
+# One MPEG-1 layer III frame header followed by silence; enough for st.audio.
+FAKE_MP3 = b"ID3\x03\x00\x00\x00\x00\x00\x00" + (b"\xff\xfb\x90\x64" + b"\x00" * 413) * 4
+FAKE_GLOSSARY = "Term,Description,Word count,Syllable\n" + "".join(
+    f"term {i},Description of phonetics term number {i}.,2,{1 + i % 4}\n" for i in range(40)
+)
+
+
+# ---------------- Stubs ----------------
+def install_stubs(tts_ms: float, net_ms: float) -> None:
+    """Replace gTTS and remote fetches with local stand-ins (process-wide)."""
+    import gtts
+
+    def write_to_fp(self, fp):
+        time.sleep(tts_ms / 1000)
+        fp.write(FAKE_MP3)
+
+    def save(self, savefile):
+        with open(savefile, "wb") as f:
+            write_to_fp(self, f)
+
+    gtts.gTTS.write_to_fp = write_to_fp
+    gtts.gTTS.save = save
+
+    def fetch(url: str, fresh_seconds: int = http.FRESH_SECONDS) -> bytes:
+        time.sleep(net_ms / 1000)
+        bundled = http.snapshot_file(url)
+        if bundled is not None:
+            return bundled.read_bytes()
+        if url.lower().endswith(".csv") or "format=csv" in url:
+            return FAKE_GLOSSARY.encode("utf-8")
+        raise http.OfflineError(f"no load-test fixture for {url}")
+
+    def exists(url: str, timeout=http.TIMEOUT) -> bool:
+        time.sleep(net_ms / 1000)
+        return False
+
+    http.fetch = fetch
+    http.exists = exists
+
+
+def share_runtime() -> None:
+    """Give every AppTest run the same runtime and script cache, as on a server.
+
+    ``AppTest`` installs a fresh mock ``Runtime`` per run and clears it
+    afterwards, which breaks concurrent runs (media and caches vanish under a
+    running script), and recompiles the page on every run, which trips
+    CPython's parser when several threads compile at once.  A server has one
+    of each, so pin one of each.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    runtime.bidi_component_registry.discover_and_register_components(start_file_watching=False)
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+
+# ---------------- Flows ----------------
+class Session:
+    """One simulated user: an AppTest plus the latency of every step."""
+
+    def __init__(self, page: Path, rng: random.Random, serialize_open: bool = True):
+        self.page = page
+        self.rng = rng
+        self.serialize_open = serialize_open
+        self.at: AppTest = None
+        self.steps: List[Dict] = []
+
+    def open(self, **state) -> AppTest:
+        """First run of the page with ``state`` preset.
+
+        Building an ``AppTest`` and its first run touch module-level Streamlit
+        state (widget registry, page compilation) that concurrent sessions
+        can trip over, which surfaces as a missing widget in the flow rather
+        than an app error.  As a harness workaround, openings are serialized
+        unless ``serialize_open`` is off, and are then reported as
+        ``SERIAL_OPEN`` so the figure is not read as concurrent-open latency.
+        An opening that raised is retried on a fresh ``AppTest``; every
+        attempt is recorded, a retried one with its errors under ``retried``.
+        """
+        name = SERIAL_OPEN if self.serialize_open else "open"
+        with _open_lock if self.serialize_open else contextlib.nullcontext():
+            for attempt in range(OPEN_ATTEMPTS):
+                self.at = AppTest.from_file(str(self.page), default_timeout=RUN_TIMEOUT)
+                for key, value in state.items():
+                    self.at.session_state[key] = value
+                record = self._run(name, lambda at: at)
+                self.steps.append(record)
+                if not record["errors"] or attempt == OPEN_ATTEMPTS - 1:
+                    break
+                record["retried"], record["errors"] = record["errors"], []
+        return self.at
+
+    def step(self, name: str, action: Callable[[AppTest], AppTest]) -> AppTest:
+        self.steps.append(self._run(name, action))
+        return self.at
+
+    @property
+    def ok(self) -> bool:
+        """False once a run raised; the flow stops, its error is already counted."""
+        return not self.at.exception
+
+    def _run(self, name: str, action: Callable[[AppTest], AppTest]) -> Dict:
+        start = time.perf_counter()
+        action(self.at).run()
+        ms = (time.perf_counter() - start) * 1000
+        errors = [str(e.value)[:200] for e in self.at.exception]
+        return {"step": name, "ms": ms, "errors": errors}
+
+
+def flow_slides(s: Session) -> None:
+    s.open(ch02_client_nav=False)
+    if not s.ok:
+        return
+    for _ in range(5):
+        s.step("next", lambda at: at.button(key="ch02_next").click())
+    s.step("prev", lambda at: at.button(key="ch02_prev").click())
+    target = s.rng.randint(1, 21)
+    s.step("go to", lambda at: at.number_input(key="ch02_slide_input").set_value(target))
+    s.step("thumbnail", lambda at: at.button(key=f"ch02_thumb_btn_{s.rng.randint(0, 5)}").click())
+
+
+def flow_transcription(s: Session) -> None:
+    s.open()
+    if not s.ok:
+        return
+    for _ in range(3):
+        s.step("new item", lambda at: at.button(key="t1_new").click())
+        s.step("check word", lambda at: (at.text_input(key="t1_typed_word").input("language"),
+                                         at.button(key="t1_check").click())[-1])
+    for _ in range(3):
+        s.step("new item", lambda at: at.button(key="t2_new_btn").click())
+        s.step("check", lambda at: (at.text_input(key="typed_answer").input("ˈlæŋɡwɪdʒ"),
+                                    at.button(key="t2_check_btn").click())[-1])
+
+
+def flow_quiz(s: Session) -> None:
+    s.open()
+    if not s.ok:
+        return
+    token = s.at.session_state["quiz_session_token"]
+    s.at.text_input(key=f"quiz_user_input_{token}").input(f"load {id(s) % 1000}")
+    s.at.radio(key=f"quiz_item_choice_{token}").set_value("10")
+    s.step("start quiz", lambda at: at.button(key=f"quiz_start_btn_{token}").click())
+    while s.ok and s.at.session_state["quiz_started"]:
+        idx = s.at.session_state["quiz_idx"]
+        answer = s.at.text_input(key=f"quiz_answer_{token}_{idx}")
+        answer.input(f"term {s.rng.randint(0, 39)}")
+        s.step("next", lambda at: at.button(key=f"quiz_next_{token}").click())
+    if s.ok and not s.at.session_state["quiz_completed"]:
+        raise RuntimeError("quiz did not complete")
+
+
+FLOWS = {"slides": flow_slides, "transcription": flow_transcription, "quiz": flow_quiz}
+
+
+def run_session(flow: str, seed: int, serialize_open: bool = True) -> List[Dict]:
+    s = Session(PAGES[flow], random.Random(seed), serialize_open)
+    try:
+        FLOWS[flow](s)
+    except Exception as e:
+        s.steps.append({"step": "flow", "ms": 0.0, "errors": [f"{type(e).__name__}: {e}"]})
+    for record in s.steps:
+        record["flow"] = flow
+    return s.steps
+
+
+# ---------------- Report ----------------
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024
+
+
+def report(steps: List[Dict]) -> List[Dict]:
+    groups: Dict[tuple, List[Dict]] = {}
+    for r in steps:
+        groups.setdefault((r["flow"], r["step"]), []).append(r)
+    rows = []
+    for (flow, step), group in groups.items():
+        ms = [r["ms"] for r in group]
+        rows.append({
+            "flow": flow,
+            "step": step,
+            "count": len(group),
+            "p50 ms": round(timing.percentile(ms, 50), 1),
+            "p95 ms": round(timing.percentile(ms, 95), 1),
+            "p99 ms": round(timing.percentile(ms, 99), 1),
+            "max ms": round(max(ms), 1),
+            "errors": sum(bool(r["errors"]) for r in group),
+            "retried": sum(bool(r.get("retried")) for r in group),
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent headless sessions against the course pages.")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions (default 8)")
+    parser.add_argument("--rounds", type=int, default=1, help="flows each session runs in turn (default 1)")
+    parser.add_argument("--flows", nargs="+", choices=sorted(FLOWS), default=sorted(FLOWS))
+    parser.add_argument("--tts-ms", type=float, default=150.0, help="stub gTTS latency (default 150)")
+    parser.add_argument("--net-ms", type=float, default=50.0, help="stub fetch latency (default 50)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrent-open", action="store_true",
+                        help="open sessions concurrently instead of one at a time (may trip AppTest)")
+    parser.add_argument("--json", type=Path, help="also write the rows and totals here")
+    args = parser.parse_args(argv)
+
+    # "missing ScriptRunContext" whenever a worker thread reads an AppTest's session state
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    install_stubs(args.tts_ms, args.net_ms)
+    share_runtime()
+    rss_before = peak_rss_mb()
+    jobs = [(args.flows[(i + r) % len(args.flows)], args.seed + i * args.rounds + r)
+            for i in range(args.sessions) for r in range(args.rounds)]
+
+    start = time.perf_counter()
+    steps: List[Dict] = []
+    lock = threading.Lock()
+
+    def worker(i: int) -> None:
+        for flow, seed in jobs[i * args.rounds:(i + 1) * args.rounds]:
+            result = run_session(flow, seed, serialize_open=not args.concurrent_open)
+            with lock:
+                steps.extend(result)
+
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        list(pool.map(worker, range(args.sessions)))
+    wall = time.perf_counter() - start
+
+    rows = report(steps)
+    print(f"{args.sessions} sessions x {args.rounds} round(s), flows: {', '.join(args.flows)}, "
+          f"{len(steps)} steps in {wall:.1f} s ({len(steps) / wall:.1f} reruns/s)")
+    if not args.concurrent_open:
+        print(f"'{SERIAL_OPEN}': openings run one at a time (harness workaround), so it is not "
+              f"concurrent-open latency; --concurrent-open times them under load")
+    print(f"{'flow':<14}{'step':<15}{'n':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'err':>5}{'retry':>6}")
+    for row in rows:
+        print(f"{row['flow']:<14}{row['step']:<15}{row['count']:>5}{row['p50 ms']:>9.1f}"
+              f"{row['p95 ms']:>9.1f}{row['p99 ms']:>9.1f}{row['max ms']:>9.1f}{row['errors']:>5}"
+              f"{row['retried']:>6}")
+    openings = [r for r in steps if r["step"] in ("open", SERIAL_OPEN)]
+    retried = sorted({e for r in openings for e in r.get("retried", [])})
+    print(f"{sum(bool(r.get('retried')) for r in openings)} of {len(openings)} opening attempt(s) "
+          f"raised and were retried")
+    for e in retried[:10]:
+        print(f"RETRIED {e}")
+    rss = peak_rss_mb()
+    print(f"peak RSS {rss:.0f} MB (before sessions {rss_before:.0f} MB)")
+
+    sections = timing.summary(timing.load_records(Path(os.environ["PHONETICS_LOG_DIR"])))
+    if sections:
+        print("slowest sections (utils.timing):")
+        for row in sections[:8]:
+            print(f"  {row['page']:<28}{row['section']:<18}p50 {row['p50 ms']:>8.1f}  p95 {row['p95 ms']:>8.1f}")
+
+    errors = sorted({e for r in steps for e in r["errors"]})
+    for e in errors[:10]:
+        print(f"ERROR {e}")
+    if args.json:
+        args.json.write_text(json.dumps({"rows": rows, "sections": sections, "wall_s": round(wall, 2),
+                                         "peak_rss_mb": round(rss, 1), "errors": errors,
+                                         "retried": retried},
+                                        indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
 import streamlit as st
-import io, requests, numpy as np
+import io, numpy as np
 import matplotlib.pyplot as plt
 
+from utils.assets import asset_bytes, asset_source, to_raw
+
 # ---------- Page setup ----------
 st.set_page_config(page_title="Multi-Apps", page_icon="🌀", layout="wide")
 st.markdown("#### 🌀 Multi-Apps for Chapter 1")
@@ -58,21 +60,13 @@ with tab3:
     # --------------------------
     st.subheader("Audio practice")
 
-    import io, requests, numpy as np
+    import io, numpy as np
     import matplotlib.pyplot as plt
 
-    # Convert normal GitHub URLs to RAW
-    def to_raw(gh_url: str) -> str:
-        if "raw.githubusercontent.com" in gh_url or gh_url.endswith("?raw=1"):
-            return gh_url
-        return gh_url.replace("https://github.com/", "https://raw.githubusercontent.com/").replace("/blob/", "/")
-
-    # Fetch bytes (cache to avoid re-downloading)
+    # Fetch bytes (local checkout first, cache to avoid re-downloading)
     @st.cache_data(show_spinner=False)
     def fetch_bytes(raw_url: str) -> bytes:
-        r = requests.get(raw_url, timeout=20)
-        r.raise_for_status()
-        return r.content
+        return asset_bytes(raw_url)
 
     # Decode WAV to (y, sr). Tries soundfile → scipy → builtin wave (16/32-bit PCM).
     def load_wav_from_bytes(b: bytes):
@@ -169,7 +163,7 @@ with tab3:
         raw_url = to_raw(gh_url)
         st.markdown(f"**{title}**")
         # Player
-        st.audio(raw_url, format="audio/wav")
+        st.audio(asset_source(raw_url), format="audio/wav")
         # Waveform
         try:
             data_bytes = fetch_bytes(raw_url)
@@ -180,7 +174,8 @@ with tab3:
 
 
 with tab4:
-    st.markdown("![Vocal anatomy for practice](https://github.com/MK316/english-phonetics/raw/main/data/Vocal-anatomy-final.png)")
+    st.image(asset_source("https://github.com/MK316/english-phonetics/raw/main/data/Vocal-anatomy-final.png"),
+             caption="Vocal anatomy for practice")
 # https://github.com/MK316/english-phonetics/blob/main/pages/audio/dolphin.wav
 
 # ================== Tips ==================
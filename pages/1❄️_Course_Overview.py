@@ -2,6 +2,9 @@ import streamlit as st
 from datetime import datetime
 import pandas as pd
 
+from utils.assets import asset_source, read_csv
+from utils.timing import cache_miss, timed
+
 st.set_page_config(page_title="📘 16-Week Course Schedule", layout="wide")
 st.title("📘 Course Overview")
 st.markdown("[Syllabus updated (asof Mar 9](https://github.com/MK316/english-phonetics/raw/main/data/Syllabus_2026S_Phonetics_updated.pdf)")
@@ -21,7 +24,8 @@ with tab1:
 
     @st.cache_data(show_spinner=False)
     def load_schedule(csv_url: str) -> pd.DataFrame:
-        df = pd.read_csv(csv_url)
+        cache_miss()
+        df = read_csv(csv_url)
         df.columns = [c.strip() for c in df.columns]
 
         # ✅ Now includes Day
@@ -61,7 +65,8 @@ with tab1:
         return df
 
     try:
-        schedule_df = load_schedule(CSV_URL)
+        with timed("load schedule", cached=True):
+            schedule_df = load_schedule(CSV_URL)
 
         q = st.text_input(
             "Filter (any keyword):",
@@ -122,7 +127,7 @@ with tab2:
 
     with col2:
         QR_URL = "https://github.com/MK316/english-phonetics/raw/main/pages/images/qr_phonetics.png"
-        st.image(QR_URL, caption="Digital classroom QR", width=150)
+        st.image(asset_source(QR_URL), caption="Digital classroom QR", width=150)
 
     st.divider()
 
@@ -134,7 +139,7 @@ with tab2:
         """
     )
     AUDIO_URL = "https://raw.githubusercontent.com/MK316/english-phonetics/main/pages/audio/phonetics-overview.mp3"
-    st.audio(AUDIO_URL, format="audio/mp3", start_time=0)
+    st.audio(asset_source(AUDIO_URL), format="audio/mp3", start_time=0)
 
     st.markdown("### 📚 Textbook & Software")
     tb, sw = st.columns(2)
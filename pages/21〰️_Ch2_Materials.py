@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 from datetime import date
 
+from utils.assets import asset_source
+
 st.set_page_config(page_title="Chapter 2 material", page_icon="📚", layout="wide")
 st.title("📚 Ch.2 Materials")
 
@@ -24,12 +26,6 @@ with tab1:
         unsafe_allow_html=True,
     )
 
-    # Helper to accept either GitHub blob or RAW links
-    def to_raw(url: str) -> str:
-        if "raw.githubusercontent.com" in url or url.endswith("?raw=1"):
-            return url
-        return url.replace("https://github.com/", "https://raw.githubusercontent.com/").replace("/blob/", "/")
-
     # Your media
     AUDIO_URL1 = "https://github.com/MK316/english-phonetics/blob/main/pages/audio/Ch2-Slide6.mp3"
     AUDIO_URL2 = "https://github.com/MK316/english-phonetics/blob/main/pages/audio/Ch2-Slide11a.mp3"
@@ -43,13 +39,13 @@ with tab1:
     # Foldable line 1 — text + audio
     with st.expander("Slide #6 - Same sound?", expanded=False):
         st.markdown("Words you've heard all include the same sound?")
-        st.audio(to_raw(AUDIO_URL1), format="audio/mp3")
+        st.audio(asset_source(AUDIO_URL1), format="audio/mp3")
 
     # Foldable line 1 — text + audio
     with st.expander("Slide #11 - 'Mary-merry-marry", expanded=False):
         st.markdown("Neutralization: 'Mary-merry-marry")
-        st.audio(to_raw(AUDIO_URL2), format="audio/mp3")
-        st.audio(to_raw(AUDIO_URL3), format="audio/mp3")
+        st.audio(asset_source(AUDIO_URL2), format="audio/mp3")
+        st.audio(asset_source(AUDIO_URL3), format="audio/mp3")
 
     with st.expander("Slide #14 - writer[ʌɪ] vs. rider[aɪ]", expanded=False):
         st.markdown("Listen to the vowels to hear the variation between 'writer' and 'rider'.")
@@ -58,15 +54,15 @@ with tab1:
         2. He said pipe—not vibe.
         3. Please read pipe first, then vibe.
         """)
-        st.audio(to_raw(AUDIO_URL4), format="audio/mp3")
+        st.audio(asset_source(AUDIO_URL4), format="audio/mp3")
 
     with st.expander("Slide #20 - Transcription reading", expanded=False):
         st.markdown("Transcription reading")
-        st.audio(to_raw(AUDIO_URL5), format="audio/mp3")
+        st.audio(asset_source(AUDIO_URL5), format="audio/mp3")
 
     with st.expander("Slide #21 - Transcription practice", expanded=False):
         st.markdown("Transcribing words")
-        st.audio(to_raw(AUDIO_URL6), format="audio/mp3")
+        st.audio(asset_source(AUDIO_URL6), format="audio/mp3")
     
     # # Foldable line 2 — video
     # with st.expander("Slide #8", expanded=False):
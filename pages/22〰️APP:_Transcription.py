@@ -1,18 +1,18 @@
 # transcription_practice_from_github_with_ipa_embed.py
 # Run: streamlit run transcription_practice_from_github_with_ipa_embed.py
 
-import io
-import math
 import random
-import unicodedata
-import wave
 from typing import Dict, List, Tuple
 
-import numpy as np
 import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
+from utils import formant, tts
+from utils.assets import read_csv
+from utils.grading import compare_transcription, compare_word
+from utils.timing import timed
+
 # ---------------- Page setup ----------------
 st.set_page_config(page_title="Transcription Practice (GitHub CSV) + IPA keyboard", layout="wide")
 st.markdown("### 🎧 Transcription Practice")
@@ -75,7 +75,7 @@ REQUIRED_COLS = {"Word", "Phonemic Transcription", "Phonetic Transcription", "Fe
 
 @st.cache_data(show_spinner=False)
 def load_csv_from_url(url: str) -> pd.DataFrame:
-    df = pd.read_csv(url)
+    df = read_csv(url)
     df.rename(columns={c: c.strip() for c in df.columns}, inplace=True)
     if not REQUIRED_COLS.issubset(set(df.columns)):
         missing = REQUIRED_COLS - set(df.columns)
@@ -112,34 +112,16 @@ if not DATASET:
     st.error("No items available. Check your CSV content.")
     st.stop()
 
-# ---------------- Audio helpers (gTTS) ----------------
-def sine_beep_wav_bytes(freq=440.0, seconds=0.7, samplerate=16000, volume=0.3) -> bytes:
-    t = np.linspace(0, seconds, int(samplerate * seconds), endpoint=False)
-    wave_data = (volume * np.sin(2 * math.pi * freq * t)).astype(np.float32)
-    data_int16 = (wave_data * 32767.0).astype(np.int16)
-    bio = io.BytesIO()
-    with wave.open(bio, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(samplerate)
-        wf.writeframes(data_int16.tobytes())
-    bio.seek(0)
-    return bio.read()
-
-@st.cache_data(show_spinner=False)
-def gtts_bytes(text: str, lang: str = "en") -> bytes:
-    from gtts import gTTS
-    bio = io.BytesIO()
-    gTTS(text=text, lang=lang, slow=False).write_to_fp(bio)
-    bio.seek(0)
-    return bio.read()
-
-def audio_for_word(word: str) -> Tuple[str, bytes]:
+# ---------------- Audio helpers (gTTS, formant synthesis offline) ----------------
+def audio_for_word(word: str, transcription: str) -> Tuple[str, bytes]:
     try:
-        mp3 = gtts_bytes(word, lang="en")
+        with timed("tts", cached=True):
+            mp3 = tts.synthesize(word, lang="en")
         return "mp3", mp3
     except Exception:
-        return "wav", sine_beep_wav_bytes()
+        # no gTTS: say the transcription itself with the local synthesizer
+        with timed("formant"):
+            return "wav", formant.wav_bytes(transcription)
 
 # ---------------- State ----------------
 def ensure_state():
@@ -168,43 +150,6 @@ def pick_new_random(old_idx: int, n: int) -> int:
     pool = [i for i in range(n) if i != old_idx]
     return random.choice(pool)
 
-# ---------------- Normalization & checking ----------------
-def normalize_word(s: str) -> str:
-    if not s:
-        return ""
-    s = s.strip().lower()
-    for ch in " -_'’":
-        s = s.replace(ch, "")
-    return s
-
-def compare_word(user_word: str, target_word: str) -> bool:
-    return normalize_word(user_word) == normalize_word(target_word)
-
-def normalize_phonemic_or_phonetic(s: str) -> str:
-    """
-    Normalization applied to both modes:
-    - NFKC
-    - remove slashes/brackets/whitespace
-    - remove stress (ˈ, ˌ) & length (ː, :)
-    - unify affricates: ʤ->dʒ, t͡ʃ->tʃ
-    - ASCII g -> IPA ɡ
-    (Other diacritics are left intact for phonetic detail.)
-    """
-    if not s:
-        return ""
-    s = unicodedata.normalize("NFKC", s)
-    for ch in "/[](){} \t\n\r":
-        s = s.replace(ch, "")
-    for ch in ["ˈ", "ˌ", "ː", ":"]:
-        s = s.replace(ch, "")
-    s = s.replace("ʤ", "dʒ")
-    s = s.replace("t͡ʃ", "tʃ")
-    s = s.replace("g", "ɡ")
-    return s
-
-def compare_transcription(user_input: str, target_str: str) -> bool:
-    return normalize_phonemic_or_phonetic(user_input) == normalize_phonemic_or_phonetic(target_str)
-
 # ---------------- Button callbacks ----------------
 def t1_new_item():
     st.session_state.idx_tab1 = pick_new_random(st.session_state.idx_tab1, len(DATASET))
@@ -245,7 +190,7 @@ with tab1:
     st.markdown(f"### 📕 2. TASK: Read the **{MODE_LABEL}** transcription while listening")
 
     item = DATASET[st.session_state.idx_tab1]
-    fmt, audio_bytes = audio_for_word(item["word"])
+    fmt, audio_bytes = audio_for_word(item["word"], item[TARGET_KEY])
 
     # st.write(f"**Word:** {item['word']}")
 
@@ -254,6 +199,11 @@ with tab1:
     st.write(f"**{MODE_LABEL.capitalize()} transcription:** {WRAP_LEFT}{shown}{WRAP_RIGHT}")
 
     st.audio(audio_bytes, format=f"audio/{fmt}")
+    with st.expander(f"🔬 Hear exactly {WRAP_LEFT}{shown}{WRAP_RIGHT} (synthesized)"):
+        st.caption("A formant synthesizer reads the symbols as written, so aspiration, taps and "
+                   "r-colored vowels are audible. Robotic, but faithful to the transcription.")
+        with timed("formant"):
+            st.audio(formant.wav_bytes(shown), format="audio/wav")
 
     st.text_input("Type the word (orthographic):", key="t1_typed_word", placeholder="e.g., language")
 
@@ -274,7 +224,7 @@ with tab2:
     st.subheader(f"Type the {MODE_LABEL} transcription after listening")
 
     item2 = DATASET[st.session_state.idx_tab2]
-    fmt2, audio_bytes2 = audio_for_word(item2["word"])
+    fmt2, audio_bytes2 = audio_for_word(item2["word"], item2[TARGET_KEY])
 
     #st.write(f"**Word:** {item2['word']}")
     st.audio(audio_bytes2, format=f"audio/{fmt2}")
@@ -1,6 +1,7 @@
 import streamlit as st
-from gtts import gTTS
-from io import BytesIO
+
+from utils import tts
+from utils.timing import timed
 
 # ---------------- Page setup ----------------
 st.set_page_config(page_title="IPA Transcription – Audio Practice", layout="centered")
@@ -16,20 +17,16 @@ PRACTICE_ITEMS = [
     # "black cat", "you and me", "this year", "good morning", "see you later",
 ]
 
-# ---------------- Helper ----------------
-def synthesize_gtts(text: str) -> bytes:
-    """Return MP3 audio bytes for the given text using gTTS."""
-    tts = gTTS(text=text, lang="en", slow=False)
-    buf = BytesIO()
-    tts.write_to_fp(buf)
-    buf.seek(0)
-    return buf.read()
-
 # ---------------- Show audio players ----------------
 st.markdown("### 🎧 Click play to listen")
 
+players = []
 for item in PRACTICE_ITEMS:
-    audio_bytes = synthesize_gtts(item)
     st.markdown(f"**{item}**")
-    st.audio(audio_bytes, format="audio/mp3")
+    players.append(st.empty())
     st.divider()
+
+# fill each player as its clip arrives; uncached items are synthesized in parallel
+with timed("tts", cached=True):
+    for i, audio_bytes in tts.synthesize_iter(PRACTICE_ITEMS):
+        players[i].audio(audio_bytes, format="audio/mp3")
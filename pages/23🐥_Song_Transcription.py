@@ -1,5 +1,7 @@
 import streamlit as st
 
+from utils.assets import asset_source
+
 # ---------------- Page setup ----------------
 st.set_page_config(
     page_title="🎵 Pop Song Transcription Project",
@@ -43,7 +45,7 @@ if song_choice != "-- Select a song --":
 
     if song_choice == "Peer Review":
         st.image(
-            selected_url,
+            asset_source(selected_url),
             caption="Peer Review",
             use_container_width=True
         )
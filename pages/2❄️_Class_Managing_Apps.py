@@ -1,20 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import qrcode
 from PIL import Image
-from wordcloud import WordCloud
 import streamlit.components.v1 as components  # For embedding YouTube videos
-from gtts import gTTS
 import io
-from streamlit_drawable_canvas import st_canvas
 import streamlit.components.v1 as components
 import random
 
+from utils import tts
+from utils.assets import read_csv
+from utils.lazy import lazy_import
+from utils.timing import timed
+
+# Heavy modules, imported when the feature that needs them is used
+qrcode = lazy_import("qrcode")
+wc = lazy_import("wordcloud")
+drawable_canvas = lazy_import("streamlit_drawable_canvas")
+
 # Function to create word cloud
 def create_wordcloud(text):
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
+    wordcloud = wc.WordCloud(width=800, height=400, background_color='white').generate(text)
     return wordcloud
 
 # Streamlit tabs
@@ -111,7 +116,7 @@ with tabs[2]:
         df = pd.read_csv(uploaded_file)
         source_label = "✅ File uploaded"
     else:
-        df = pd.read_csv(default_url)
+        df = read_csv(default_url)
         source_label = "📂 Using default GitHub data"
 
     if all(col in df.columns for col in ['Course', 'Names']):
@@ -256,19 +261,24 @@ with tabs[4]:
         }
         language_code, tld = lang_codes[language]
 
-        # Assuming you have a version of gTTS that supports tld or you have modified it:
-        # This check ensures that the tld parameter is only used when not None.
-        if tld:
-            tts = gTTS(text=text_input, lang=language_code, tld=tld, slow=False)
+        # One clip per sentence, synthesized in parallel and cached separately:
+        # the first sentence can be played while the rest is on its way.
+        chunks = tts.split_sentences(text_input)
+        if not chunks:
+            st.warning("Please enter some text to convert.")
         else:
-            tts = gTTS(text=text_input, lang=language_code, slow=False)
-        
-        speech = io.BytesIO()
-        tts.write_to_fp(speech)
-        speech.seek(0)
-
-        # Display the audio file
-        st.audio(speech.getvalue(), format='audio/mp3')
+            full_slot = st.empty()
+            full_slot.caption(f"Preparing {len(chunks)} sentence(s)…")
+            with st.expander("Sentence by sentence", expanded=len(chunks) > 1):
+                sentence_slots = [st.empty() for _ in chunks]
+            clips = [None] * len(chunks)
+            with timed("tts", cached=True):
+                for i, clip in tts.synthesize_iter(chunks, lang=language_code, tld=tld, slow=False):
+                    clips[i] = clip
+                    sentence_slots[i].audio(clip, format='audio/mp3')
+
+            # Display the audio file
+            full_slot.audio(tts.join(clips), format='audio/mp3')
     st.markdown("---")
     st.caption("🇺🇸 English text: Teacher-designed coding applications create tailored learning experiences, making complex concepts easier to understand through interactive and adaptive tools. They enhance engagement, provide immediate feedback, and support active learning.")
     st.caption("🇰🇷 Korean text: 교사가 직접 만든 코딩 기반 애플리케이션은 학습자의 필요에 맞춘 학습 경험을 제공하고, 복잡한 개념을 쉽게 이해하도록 돕습니다. 또한 학습 몰입도를 높이고 즉각적인 피드백을 제공하며, 능동적인 학습을 지원합니다.")
@@ -279,34 +289,35 @@ with tabs[4]:
 
 with tabs[5]:
     st.caption("Use the canvas below to draw freely. You can change the stroke width and color.")
+    # st.tabs runs every tab on every rerun; the canvas component is only loaded once switched on
+    if st.toggle("🎨 Open the drawing canvas", key="drawing_on"):
+        # Place Stroke Width, Stroke Color, and Background Color in the same row
+        col1, col2, col3 = st.columns([1, 1, 1])
+
+        with col1:
+            stroke_width = st.slider("✏️ Stroke Width", 1, 10, 5)
+        with col2:
+            stroke_color = st.color_picker("🖌 Stroke Color", "#000000")
+        with col3:
+            bg_color = st.color_picker("🖼 Background Color", "#FFFFFF")
+
+        # Initialize session state for clearing
+        if "clear_canvas" not in st.session_state:
+            st.session_state["clear_canvas"] = False
+
+        # Create the canvas (Unique key prevents duplication)
+        canvas_result = drawable_canvas.st_canvas(
+            fill_color="rgba(255, 165, 0, 0.3)",  
+            stroke_width=stroke_width,
+            stroke_color=stroke_color,
+            background_color=bg_color,
+            height=400,
+            width=600,
+            drawing_mode="freedraw",
+            key="main_canvas" if not st.session_state["clear_canvas"] else "new_canvas"
+        )
 
-   # Place Stroke Width, Stroke Color, and Background Color in the same row
-    col1, col2, col3 = st.columns([1, 1, 1])
-
-    with col1:
-        stroke_width = st.slider("✏️ Stroke Width", 1, 10, 5)
-    with col2:
-        stroke_color = st.color_picker("🖌 Stroke Color", "#000000")
-    with col3:
-        bg_color = st.color_picker("🖼 Background Color", "#FFFFFF")
-
-    # Initialize session state for clearing
-    if "clear_canvas" not in st.session_state:
-        st.session_state["clear_canvas"] = False
-
-    # Create the canvas (Unique key prevents duplication)
-    canvas_result = st_canvas(
-        fill_color="rgba(255, 165, 0, 0.3)",  
-        stroke_width=stroke_width,
-        stroke_color=stroke_color,
-        background_color=bg_color,
-        height=400,
-        width=600,
-        drawing_mode="freedraw",
-        key="main_canvas" if not st.session_state["clear_canvas"] else "new_canvas"
-    )
-
-    # Clear Canvas button
-    if st.button("🗑️ Clear Canvas"):
-        st.session_state["clear_canvas"] = not st.session_state["clear_canvas"]
-        st.rerun()  # This forces Streamlit to reload and clear the drawing
+        # Clear Canvas button
+        if st.button("🗑️ Clear Canvas"):
+            st.session_state["clear_canvas"] = not st.session_state["clear_canvas"]
+            st.rerun()  # This forces Streamlit to reload and clear the drawing
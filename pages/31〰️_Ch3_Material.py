@@ -1,11 +1,16 @@
 import streamlit as st
-import librosa
-import librosa.display
-import matplotlib.pyplot as plt
 import numpy as np
-import requests
 import io
 
+from utils.assets import asset_bytes, asset_source
+from utils.lazy import lazy_import
+from utils.timing import cache_miss, timed
+
+# librosa takes seconds to import; defer it until the audio is loaded
+librosa = lazy_import("librosa")
+librosa_display = lazy_import("librosa.display")
+plt = lazy_import("matplotlib.pyplot")
+
 st.set_page_config(page_title="Spectrogram & Waveform Viewer", layout="centered")
 st.title("🎧 Audio Visualization: Waveform + Spectrogram")
 st.markdown("[I say tie](https://github.com/MK316/english-phonetics/blob/main/pages/audio/tie-dye-sty.mp3)")
@@ -16,30 +21,32 @@ url = "https://raw.githubusercontent.com/MK316/english-phonetics/main/pages/audi
 # --- Load audio from URL ---
 @st.cache_data
 def load_audio_from_url(url):
-    response = requests.get(url)
-    if response.status_code != 200:
+    cache_miss()
+    try:
+        audio_bytes = io.BytesIO(asset_bytes(url))
+    except Exception:
         st.error("Audio could not be loaded.")
         return None, None
-    audio_bytes = io.BytesIO(response.content)
     y, sr = librosa.load(audio_bytes, sr=None)
     return y, sr
 
-y, sr = load_audio_from_url(url)
+with timed("load audio", cached=True):
+    y, sr = load_audio_from_url(url)
 
 if y is not None:
-    st.audio(url)
+    st.audio(asset_source(url))
 
     # --- Plotting ---
     fig, ax = plt.subplots(2, 1, figsize=(10, 6), sharex=True)
 
     # Waveform
-    librosa.display.waveshow(y, sr=sr, ax=ax[0], color='steelblue')
+    librosa_display.waveshow(y, sr=sr, ax=ax[0], color='steelblue')
     ax[0].set(title='Waveform')
     ax[0].label_outer()
 
     # Spectrogram
     D = librosa.amplitude_to_db(np.abs(librosa.stft(y)), ref=np.max)
-    img = librosa.display.specshow(D, sr=sr, x_axis='time', y_axis='log', ax=ax[1], cmap='magma')
+    img = librosa_display.specshow(D, sr=sr, x_axis='time', y_axis='log', ax=ax[1], cmap='magma')
     ax[1].set(title='Spectrogram (log scale)')
     fig.colorbar(img, ax=ax[1], format="%+2.0f dB")
 
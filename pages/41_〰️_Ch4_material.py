@@ -2,7 +2,8 @@ import streamlit as st
 
 from PIL import Image
 from io import BytesIO
-import requests
+
+from utils.http import fetch
 
 st.set_page_config(page_title="Final IPA Vowel Chart", layout="wide")
 
@@ -171,9 +172,7 @@ with tab3:
     image_url = "https://github.com/MK316/APP4U/raw/main/images/diphthongs.png"
 
     try:
-        response = requests.get(image_url)
-        response.raise_for_status()
-        image = Image.open(BytesIO(response.content))
+        image = Image.open(BytesIO(fetch(image_url)))
         st.image(image, caption="Vowel chart to draw diphthongs", use_container_width=True)
     except Exception as e:
         st.error(f"❌ Failed to load the image: {e}")
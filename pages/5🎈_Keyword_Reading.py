@@ -2,8 +2,9 @@ import re
 from datetime import datetime
 import pandas as pd
 import streamlit as st
-import io
-import requests
+
+from utils.assets import read_csv
+from utils.grading import normalize_text, render_passage_with_numbered_blanks
 
 # =========================
 # CONFIG
@@ -16,15 +17,6 @@ CSV_URL = "https://raw.githubusercontent.com/MK316/english-phonetics/refs/heads/
 # =========================
 # HELPERS
 # =========================
-BLANK10_HTML = '<span style="font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace;">__________</span>'
-
-def normalize_text(s: str) -> str:
-    """Lowercase + keep letters/apostrophes + single-space."""
-    s = str(s).strip().lower()
-    s = re.sub(r"[^a-zA-Z'\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
 def parse_correct_answers(ans_cell: str) -> list[list[str]]:
     items = [a.strip() for a in str(ans_cell).split(",") if a.strip()]
     out: list[list[str]] = []
@@ -33,25 +25,6 @@ def parse_correct_answers(ans_cell: str) -> list[list[str]]:
         out.append(words if words else item.split())
     return out
 
-def render_passage_with_numbered_blanks(passage: str, correct_items: list[list[str]]) -> str:
-    replacements = []
-    for i, words in enumerate(correct_items, start=1):
-        n = max(1, len(words))
-        blanks = " ".join([BLANK10_HTML] * n)
-        replacements.append(f'<b>({i})</b> {blanks}')
-
-    pattern = r"_{2,}"
-    matches = list(re.finditer(pattern, str(passage)))
-
-    out = []
-    last = 0
-    for idx, m in enumerate(matches):
-        out.append(passage[last:m.start()])
-        out.append(replacements[idx] if idx < len(replacements) else BLANK10_HTML)
-        last = m.end()
-    out.append(passage[last:])
-    return "".join(out).replace("\n", "<br>")
-
 def expected_flat_list(correct_items: list[list[str]]) -> list[str]:
     exp = []
     for words in correct_items:
@@ -61,8 +34,7 @@ def expected_flat_list(correct_items: list[list[str]]) -> list[str]:
 
 @st.cache_data(show_spinner=False)
 def load_data(url: str) -> pd.DataFrame:
-    r = requests.get(url)
-    df = pd.read_csv(io.BytesIO(r.content))
+    df = read_csv(url)
     col_map = {}
     for c in df.columns:
         cc = c.strip().lower()
@@ -2,6 +2,8 @@
 from io import BytesIO
 from datetime import datetime
 import os
+import sys
+from pathlib import Path
 
 import streamlit as st
 import pandas as pd
@@ -13,6 +15,10 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for utils/
+from utils import grading
+from utils.timing import timed
+
 # ===== App setup =====
 st.set_page_config(page_title="IPA Practice — Step-by-Step", layout="centered")
 st.markdown("#### 🐾 IPA Practice — Describing 24 English consonants")
@@ -173,24 +179,8 @@ def selections_to_df():
     return pd.DataFrame(data, columns=["IPA"] + FEATURES_ORDER)
 
 def compute_wrong_mask_and_feedback(df_user: pd.DataFrame):
-    df_ans = pd.DataFrame(
-        [{"IPA": sym, **ANSWER_KEY[sym]} for sym in ipa_symbols],
-        columns=["IPA"] + FEATURES_ORDER
-    )
-    wrong_mask = pd.DataFrame(False, index=df_user.index, columns=df_user.columns)
-    for feat in FEATURES_ORDER:
-        wrong_mask[feat] = df_user[feat] != df_ans[feat]
-    wrong_mask["IPA"] = False
-
-    feedback_lines = []
-    for i, sym in enumerate(df_user["IPA"]):
-        wrong_feats = [feat for feat in FEATURES_ORDER if wrong_mask.loc[i, feat]]
-        if wrong_feats:
-            detail = ", ".join(
-                f"{feat}: expected {df_ans.loc[i, feat]} / got {df_user.loc[i, feat]}"
-                for feat in wrong_feats
-            )
-            feedback_lines.append(f"• {sym} — {detail}")
+    df_ans = grading.answer_frame(ANSWER_KEY, ipa_symbols, FEATURES_ORDER)
+    wrong_mask, feedback_lines = grading.compute_wrong_mask_and_feedback(df_user, df_ans, FEATURES_ORDER)
     return wrong_mask, feedback_lines, df_ans
 
 # ===== PDF helpers =====
@@ -280,7 +270,8 @@ def build_pdf(df_user: pd.DataFrame, wrong_mask: pd.DataFrame, feedback_lines, g
     else:
         elements.append(Paragraph("All correct. Well done!", fb_style))
 
-    doc.build(elements)
+    with timed("pdf build"):
+        doc.build(elements)
     buf.seek(0)
     return buf.getvalue()
 
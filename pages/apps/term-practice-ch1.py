@@ -1,14 +1,19 @@
 import re
+import sys
 import unicodedata
 import streamlit as st
 import pandas as pd
-from gtts import gTTS
-from io import BytesIO
 import random
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import textwrap
 import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for utils/
+from utils import tts
+from utils.assets import read_csv
+from utils.timing import timed
 
 # ---------------- Page setup ----------------
 st.set_page_config(page_title="Term Practice", page_icon="📘", layout="wide")
@@ -18,7 +23,7 @@ st.markdown("#### 📘 Term Practice: Text, Audio, and Quiz")
 @st.cache_data
 def load_data():
     url = "https://raw.githubusercontent.com/MK316/classmaterial/main/Phonetics/ch01_glossary_0915.csv"
-    df = pd.read_csv(url)
+    df = read_csv(url)
     df = df.dropna(subset=["Term", "Description"])
     if "Word count" in df.columns:
         df["Word count"] = pd.to_numeric(df["Word count"], errors="coerce").fillna(0).astype(int)
@@ -32,14 +37,6 @@ def load_data():
 
 df = load_data()
 
-# ---------------- TTS Cache ----------------
-@st.cache_data(show_spinner=False)
-def tts_bytes(text: str) -> bytes:
-    fp = BytesIO()
-    gTTS(text).write_to_fp(fp)
-    fp.seek(0)
-    return fp.read()
-
 # ---------------- Helpers ----------------
 def word_count_from_row(row) -> int:
     try:
@@ -119,13 +116,9 @@ with tab2:
         st.session_state.audio_answers = [""] * num_items
 
     if "practice_set" in st.session_state and st.session_state.practice_set is not None:
+        players = []
         for i, row in st.session_state.practice_set.iterrows():
-            text = row["Description"]
-            tts = gTTS(text)
-            mp3_fp = BytesIO()
-            tts.write_to_fp(mp3_fp)
-
-            st.audio(mp3_fp.getvalue(), format="audio/mp3")
+            players.append(st.empty())
 
             word_count = row["Word count"]
             label = f"Your answer {i+1} ({word_count} word{'s' if word_count > 1 else ''})"
@@ -136,6 +129,11 @@ with tab2:
                 key=f"answer_input_{i}"
             )
 
+        # the answer boxes are already on screen; players appear as their clips are ready
+        with timed("tts", cached=True):
+            for i, mp3 in tts.synthesize_iter(st.session_state.practice_set["Description"]):
+                players[i].audio(mp3, format="audio/mp3")
+
         if st.button("✅ Check Answers"):
             score = 0
             for i, row in st.session_state.practice_set.iterrows():
@@ -274,7 +272,8 @@ with tab3:
         ]))
 
         elements.append(table)
-        doc.build(elements)
+        with timed("pdf build"):
+            doc.build(elements)
         buffer.seek(0)
         return buffer.getvalue()
 
@@ -326,7 +325,9 @@ with tab3:
         row = df.loc[st.session_state.quiz_order[idx]]
 
         st.info(f"Question {idx + 1} of {total} | Selected set: {st.session_state.quiz_num_items}")
-        st.audio(tts_bytes(row["Description"]), format="audio/mp3")
+        with timed("tts", cached=True):
+            quiz_audio = tts.synthesize(row["Description"])
+        st.audio(quiz_audio, format="audio/mp3")
         st.write(answer_prompt(row))
 
         answer_key = f"quiz_answer_{st.session_state.quiz_session_token}_{idx}"
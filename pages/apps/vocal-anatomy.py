@@ -1,13 +1,18 @@
-import re
-import unicodedata
+import sys
 from datetime import datetime
 from io import BytesIO
+from pathlib import Path
 import streamlit as st
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for utils/
+from utils.assets import asset_source
+from utils.grading import is_accepted
+from utils.timing import timed
+
 # ---------------- Page setup ----------------
 st.set_page_config(page_title="Vocal Organs Quiz", page_icon="🗣️", layout="wide")
 st.markdown("#### 🗣️ Understanding Speech Production")
@@ -24,20 +29,8 @@ ANSWER_KEY = {
 }
 
 # ---------------- Helpers ----------------
-def normalize(s: str) -> str:
-    s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
-    s = s.lower().strip()
-    s = re.sub(r"[\-_/]", " ", s)
-    s = re.sub(r"[^a-z\s]", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
 def is_correct(num: int, user_text: str) -> bool:
-    if not user_text:
-        return False
-    gold = [normalize(x) for x in ANSWER_KEY.get(num, [])]
-    guess = normalize(user_text)
-    return guess in gold or (guess.endswith("s") and guess[:-1] in gold) or ((guess + "s") in gold)
+    return is_accepted(user_text, ANSWER_KEY.get(num, []))
 
 # ---------------- Session ----------------
 if "answers" not in st.session_state:
@@ -48,7 +41,7 @@ if "pdf_ready" not in st.session_state:
     st.session_state.pdf_ready = False
 
 # ---------------- UI ----------------
-st.image(IMAGE_URL, width=400, caption="Refer to the numbers (1–14) on this diagram.")
+st.image(asset_source(IMAGE_URL), width=400, caption="Refer to the numbers (1–14) on this diagram.")
 name = st.text_input("✍️ Enter your name (optional):")
 
 with st.form("quiz_form"):
@@ -108,7 +101,7 @@ def generate_pdf(name, answers, results):
     elements.append(Paragraph(f"Timestamp: {timestamp}", styles["Normal"]))
     elements.append(Spacer(1, 12))
 
-    elements.append(Image(IMAGE_URL, width=300, height=300))
+    elements.append(Image(asset_source(IMAGE_URL), width=300, height=300))
     elements.append(Spacer(1, 12))
 
     header = ["No.", "Your Answer", "Correct Answer(s)", "Result"]
@@ -129,7 +122,8 @@ def generate_pdf(name, answers, results):
     ]))
     elements.append(tbl)
 
-    doc.build(elements)
+    with timed("pdf build"):
+        doc.build(elements)
     buffer.seek(0)
     return buffer
 
@@ -0,0 +1 @@
+"""Shared helpers for the English Phonetics course pages."""
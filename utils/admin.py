@@ -0,0 +1,93 @@
+"""Hidden admin view: render timings, cache statistics, coalesced requests and session memory.
+
+Not a page of its own (every file in ``pages/`` shows up in the sidebar);
+``HOME.py`` shows it instead of the home page when opened as
+``/?admin=<token>``, where the token is ``PHONETICS_ADMIN_TOKEN`` or
+``admin_token`` in ``.streamlit/secrets.toml``.  Without a token configured
+the view is disabled.
+"""
+import hmac
+import os
+from datetime import datetime
+from typing import Optional
+
+import streamlit as st
+
+from utils import memory, singleflight, timing
+
+
+def admin_token() -> Optional[str]:
+    token = os.environ.get("PHONETICS_ADMIN_TOKEN")
+    if token:
+        return token
+    try:
+        return st.secrets.get("admin_token") or None
+    except Exception:  # no secrets.toml
+        return None
+
+
+def is_admin() -> bool:
+    token = admin_token()
+    given = st.query_params.get("admin")
+    return bool(token and given) and hmac.compare_digest(str(given), token)
+
+
+def _cache_stats():
+    from utils.assets import ASSET_STORE
+    from utils.formant import FORMANT_STORE
+    from utils.thumbnails import THUMB_STORE
+    from utils.tts import TTS_STORE
+
+    rows = []
+    for name, store in (("assets", ASSET_STORE), ("thumbnails", THUMB_STORE), ("tts", TTS_STORE),
+                        ("formant", FORMANT_STORE)):
+        stats = store.stats()
+        lookups = stats["hits"] + stats["misses"]
+        rows.append({
+            "store": name,
+            "entries": stats["entries"],
+            "MB": round(stats["bytes"] / 2**20, 1),
+            "max MB": round(stats["max_bytes"] / 2**20, 1),
+            "hit rate": round(stats["hits"] / lookups, 3) if lookups else None,
+            "evictions": stats["evictions"],
+        })
+    return rows
+
+
+def render_admin() -> None:
+    st.title("🛠️ Admin: render timings")
+    records = timing.load_records()
+    if records:
+        first = datetime.fromtimestamp(records[0]["ts"]).strftime("%Y-%m-%d %H:%M")
+        st.caption(f"{len(records)} records since {first} · {timing.LOG_DIR / timing.LOG_FILE}")
+    else:
+        st.info("No timing records yet.")
+
+    pages = sorted({r["page"] for r in records})
+    picked = st.multiselect("Pages", pages, default=pages)
+    rows = timing.summary([r for r in records if r["page"] in picked])
+    st.subheader("Sections (p50 / p95)")
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+    st.subheader("In-process caches")
+    st.dataframe(_cache_stats(), use_container_width=True, hide_index=True)
+
+    st.subheader("Coalesced requests")
+    st.caption("Concurrent identical TTS syntheses and HTTP fetches that waited on one call.")
+    st.dataframe(singleflight.stats(), use_container_width=True, hide_index=True)
+
+    st.subheader("Session memory")
+    # outside a server (tests, bare mode) there is only this session to show
+    mem = memory.report(memory.live_sessions() or [("this", st.session_state)])
+    total = sum(r["MB"] for r in mem["sessions"])
+    st.caption(f"{len(mem['sessions'])} live sessions · {total:.1f} MB in session state · "
+               f"budget {memory.SESSION_BUDGET_MB:.0f} MB per session")
+    over = [r["session"] for r in mem["sessions"] if r["over budget"]]
+    if over:
+        st.warning(f"Over budget: {', '.join(over)}")
+    col1, col2 = st.columns(2)
+    col1.dataframe(mem["sessions"], use_container_width=True, hide_index=True)
+    col2.dataframe(mem["prefixes"], use_container_width=True, hide_index=True)
+
+    with st.expander("Latest records"):
+        st.dataframe(list(reversed(records[-200:])), use_container_width=True, hide_index=True)
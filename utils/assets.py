@@ -0,0 +1,106 @@
+"""Local-first resolution of repo-owned asset URLs.
+
+Pages refer to slides, audio, images and CSVs by their GitHub URLs
+(``github.com/MK316/english-phonetics/blob/...`` or
+``raw.githubusercontent.com/MK316/english-phonetics/...``).  Every one of those
+files also ships in this checkout, so the server reads it from disk and only
+falls back to the network when the file is not present locally.
+
+    st.image(asset_source(url))          # local path if we have it, else the URL
+    data = asset_bytes(url)              # bytes; local files kept in a shared bounded LRU
+    df = read_csv(url)                   # DataFrame from the same bytes
+
+Anything else goes through ``utils.http`` (pooled session + disk cache), which
+also decides when a remote copy is stale, so remote bytes are not held here.
+"""
+import io
+import re
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote
+
+from utils import http
+from utils.cache import ByteLRU
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+GITHUB_OWNER = "MK316"
+GITHUB_REPO = "english-phonetics"
+ASSET_CACHE_BYTES = 96 * 1024 * 1024
+
+_REPO_URL_PATTERNS = [
+    re.compile(
+        rf"^https?://raw\.githubusercontent\.com/{GITHUB_OWNER}/{GITHUB_REPO}/"
+        r"(?:refs/heads/)?[^/]+/(?P<path>[^?#]+)"
+    ),
+    re.compile(
+        rf"^https?://github\.com/{GITHUB_OWNER}/{GITHUB_REPO}/(?:blob|raw)/"
+        r"(?:refs/heads/)?[^/]+/(?P<path>[^?#]+)"
+    ),
+]
+
+# Local files keyed by (path, mtime_ns, size); shared by all sessions.  Remote files are
+# not stored here: http.fetch revalidates them after FRESH_SECONDS (schedule, glossary).
+ASSET_STORE = ByteLRU(ASSET_CACHE_BYTES)
+
+
+def to_raw(gh_url: str) -> str:
+    """Convert a github.com blob URL to its raw.githubusercontent.com form."""
+    if "raw.githubusercontent.com" in gh_url or gh_url.endswith("?raw=1"):
+        return gh_url
+    return gh_url.replace("https://github.com/", "https://raw.githubusercontent.com/").replace("/blob/", "/")
+
+
+def repo_path(url: str) -> Optional[str]:
+    """Repo-relative path for a URL that points into this repository."""
+    for pattern in _REPO_URL_PATTERNS:
+        m = pattern.match(url.strip())
+        if m:
+            return unquote(m.group("path"))
+    return None
+
+
+def local_path(url: str) -> Optional[Path]:
+    """The file in the local checkout that ``url`` refers to, if it exists."""
+    rel = repo_path(url)
+    if rel is None:
+        return None
+    path = (REPO_ROOT / rel).resolve()
+    if REPO_ROOT not in path.parents or not path.is_file():
+        return None
+    return path
+
+
+def asset_source(url: str) -> str:
+    """A local file path for repo-owned assets (or bundled ones, offline), otherwise the URL.
+
+    Suitable for anything that accepts either (st.image, st.audio,
+    pd.read_csv, reportlab Image).
+    """
+    path = local_path(url)
+    if path is None and http.OFFLINE:
+        path = http.snapshot_file(url)
+    return str(path) if path is not None else url
+
+
+def _local_key(path: Path):
+    st_ = path.stat()
+    return (str(path), st_.st_mtime_ns, st_.st_size)
+
+
+def read_local(path: Path) -> bytes:
+    return ASSET_STORE.get_or_load(_local_key(path), path.read_bytes)
+
+
+def asset_bytes(url: str) -> bytes:
+    """Bytes of an asset, from the local checkout when possible."""
+    path = local_path(url)
+    if path is not None:
+        return read_local(path)
+    return http.fetch(to_raw(url))
+
+
+def read_csv(url: str, **kwargs):
+    """``pd.read_csv`` over ``asset_bytes``: local file if we have it, else the cached fetch."""
+    import pandas as pd
+
+    return pd.read_csv(io.BytesIO(asset_bytes(url)), **kwargs)
@@ -0,0 +1,379 @@
+"""Offline source-filter synthesis of IPA transcriptions.
+
+Renders what a transcription says, not what a word usually sounds like, so
+students can hear the allophones on the page (aspiration, taps, r-coloured
+vowels, syllabic and devoiced consonants) without gTTS::
+
+    from utils import formant
+
+    wav = formant.wav_bytes("ˈwɔɾɚ")               # mono 16 kHz WAV
+    wav = formant.wav_bytes("[ˈpʰeɪpɚ]")           # slashes/brackets are ignored
+
+    python -m utils.formant "ˈkʰʌp̚bɔɹd" -o cupboard.wav
+    python -m utils.formant pages/data/IPAdata4.csv --column "Phonetic Transcription" --out .cache/formant
+
+Each phone maps to formant targets (F1-F3), a duration and a source:
+voicing, frication noise or both.  Tracks are interpolated between targets
+per sample and the voiced part is additive harmonic synthesis (every
+harmonic of f0 weighted by the formant envelope), so a word is a handful of
+array operations rather than a per-sample filter loop.  Noise is shaped per
+segment in the frequency domain.  It is intelligible, not natural.
+
+Rendered clips are kept in ``FORMANT_STORE``; unknown symbols are skipped.
+"""
+import argparse
+import csv
+import io
+import sys
+import time
+import unicodedata
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.cache import ByteLRU
+
+SAMPLE_RATE = 16000
+FORMANT_MEMORY_BYTES = 8 * 1024 * 1024
+BANDWIDTHS = (80.0, 100.0, 150.0, 250.0)
+F4 = 3500.0
+RAMP_MS = 6
+
+FORMANT_STORE = ByteLRU(FORMANT_MEMORY_BYTES)
+
+Formants = Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class Phone:
+    kind: str                           # vowel, approximant, nasal, stop, fricative, affricate, tap, glottal
+    formants: Formants                  # targets, or the place locus for obstruents
+    ms: float
+    voiced: bool = True
+    end: Optional[Formants] = None      # diphthong offglide
+    noise: Optional[Tuple[float, float, float]] = None  # frication (centre Hz, bandwidth Hz, level)
+
+
+_BILABIAL, _LABIODENTAL, _DENTAL = (200, 800, 2200), (250, 1100, 2300), (250, 1400, 2600)
+_ALVEOLAR, _POSTALVEOLAR, _VELAR = (200, 1700, 2600), (250, 1900, 2500), (200, 2000, 2400)
+
+PHONES: Dict[str, Phone] = {
+    # monophthongs
+    "i": Phone("vowel", (270, 2290, 3010), 110),
+    "ɪ": Phone("vowel", (390, 1990, 2550), 90),
+    "e": Phone("vowel", (480, 2100, 2700), 110),
+    "ɛ": Phone("vowel", (530, 1840, 2480), 100),
+    "æ": Phone("vowel", (660, 1720, 2410), 130),
+    "a": Phone("vowel", (750, 1300, 2500), 120),
+    "ɑ": Phone("vowel", (730, 1090, 2440), 130),
+    "ɒ": Phone("vowel", (650, 950, 2400), 120),
+    "ɔ": Phone("vowel", (570, 840, 2410), 130),
+    "o": Phone("vowel", (500, 900, 2400), 110),
+    "ʊ": Phone("vowel", (440, 1020, 2240), 90),
+    "u": Phone("vowel", (300, 870, 2240), 110),
+    "ʌ": Phone("vowel", (640, 1190, 2390), 100),
+    "ə": Phone("vowel", (500, 1500, 2500), 70),
+    "ɜ": Phone("vowel", (550, 1400, 2450), 120),
+    "ɝ": Phone("vowel", (480, 1350, 1690), 130),   # r-coloured: low F3
+    "ɚ": Phone("vowel", (500, 1400, 1700), 100),
+    # diphthongs
+    "eɪ": Phone("vowel", (480, 2100, 2700), 170, end=(390, 1990, 2550)),
+    "aɪ": Phone("vowel", (750, 1300, 2500), 190, end=(390, 1990, 2550)),
+    "aʊ": Phone("vowel", (750, 1300, 2500), 190, end=(440, 1020, 2240)),
+    "oʊ": Phone("vowel", (500, 900, 2400), 170, end=(440, 1020, 2240)),
+    "ɔɪ": Phone("vowel", (570, 840, 2410), 190, end=(390, 1990, 2550)),
+    # approximants
+    "ɹ": Phone("approximant", (310, 1060, 1380), 70),
+    "l": Phone("approximant", (360, 1300, 2700), 70),
+    "ɫ": Phone("approximant", (400, 900, 2600), 80),  # dark l: low F2
+    "w": Phone("approximant", (290, 610, 2150), 70),
+    "j": Phone("approximant", (260, 2070, 3020), 70),
+    # nasals
+    "m": Phone("nasal", (250, 900, 2200), 75),
+    "n": Phone("nasal", (250, 1700, 2600), 70),
+    "ŋ": Phone("nasal", (250, 2000, 2600), 80),
+    # stops: closure, then burst and voice onset
+    "p": Phone("stop", _BILABIAL, 70, voiced=False, noise=(900, 1800, 0.3)),
+    "b": Phone("stop", _BILABIAL, 60, noise=(900, 1800, 0.2)),
+    "t": Phone("stop", _ALVEOLAR, 65, voiced=False, noise=(4000, 3000, 0.35)),
+    "d": Phone("stop", _ALVEOLAR, 55, noise=(4000, 3000, 0.25)),
+    "k": Phone("stop", _VELAR, 70, voiced=False, noise=(2200, 1500, 0.35)),
+    "ɡ": Phone("stop", _VELAR, 60, noise=(2200, 1500, 0.25)),
+    "ʔ": Phone("glottal", _ALVEOLAR, 50, voiced=False),
+    "ɾ": Phone("tap", (300, 1700, 2600), 25),
+    # fricatives
+    "f": Phone("fricative", _LABIODENTAL, 100, voiced=False, noise=(5000, 5000, 0.06)),
+    "v": Phone("fricative", _LABIODENTAL, 70, noise=(5000, 5000, 0.04)),
+    "θ": Phone("fricative", _DENTAL, 100, voiced=False, noise=(5500, 5000, 0.05)),
+    "ð": Phone("fricative", _DENTAL, 60, noise=(5500, 5000, 0.04)),
+    "s": Phone("fricative", _ALVEOLAR, 110, voiced=False, noise=(5500, 2000, 0.3)),
+    "z": Phone("fricative", _ALVEOLAR, 85, noise=(5500, 2000, 0.18)),
+    "ʃ": Phone("fricative", _POSTALVEOLAR, 110, voiced=False, noise=(3000, 1800, 0.3)),
+    "ʒ": Phone("fricative", _POSTALVEOLAR, 80, noise=(3000, 1800, 0.18)),
+    "h": Phone("fricative", (500, 1500, 2500), 70, voiced=False),  # shaped by the next vowel
+    # affricates: a stop closure released into frication
+    "tʃ": Phone("affricate", _POSTALVEOLAR, 60, voiced=False, noise=(3000, 1800, 0.3)),
+    "dʒ": Phone("affricate", _POSTALVEOLAR, 50, noise=(3000, 1800, 0.18)),
+}
+
+# symbols folded onto the ones above before parsing
+_FOLD = str.maketrans({"g": "ɡ", "r": "ɹ", "ʧ": "tʃ", "ʤ": "dʒ", "ɐ": "ə", "ɨ": "ɪ", "͡": None, "͜": None})
+_IGNORED = set("/[]() .‿|-̃")  # delimiters, syllable breaks, nasalization
+_STRESS = {"ˈ": 2, "ˌ": 1}
+_MODIFIERS = {
+    "ʰ": "aspirated",
+    "̚": "unreleased",   # p̚
+    "̥": "devoiced",     # ɹ̥
+    "̊": "devoiced",
+    "̩": "syllabic",     # l̩
+    "̍": "syllabic",
+    "ː": "long",
+    "ˑ": "long",
+}
+_LONGEST = max(len(k) for k in PHONES)
+
+
+@dataclass
+class Token:
+    symbol: str
+    stress: int = 0
+    mods: frozenset = frozenset()
+
+
+def parse(ipa: str) -> Tuple[List[Token], List[str]]:
+    """Phones with their stress and diacritics, and the symbols that were skipped."""
+    s = unicodedata.normalize("NFC", str(ipa)).strip().translate(_FOLD)
+    tokens: List[Token] = []
+    skipped: List[str] = []
+    stress, i = 0, 0
+    while i < len(s):
+        ch = s[i]
+        if ch in _STRESS:
+            stress = _STRESS[ch]
+        elif ch in _MODIFIERS:
+            if tokens:
+                tokens[-1].mods = tokens[-1].mods | {_MODIFIERS[ch]}
+        elif ch.isspace() or ch in _IGNORED:
+            pass
+        else:
+            for size in range(_LONGEST, 0, -1):
+                if s[i:i + size] in PHONES:
+                    tokens.append(Token(s[i:i + size], stress))
+                    stress = 0
+                    i += size
+                    break
+            else:
+                skipped.append(ch)
+                i += 1
+            continue
+        i += 1
+    return tokens, skipped
+
+
+def _is_nucleus(token: Token) -> bool:
+    return PHONES[token.symbol].kind == "vowel" or "syllabic" in token.mods
+
+
+def _segments(tokens: List[Token]) -> List[Dict]:
+    """Timed segments with formant targets and source levels."""
+    # a stress mark belongs to the syllable it precedes: move it to that syllable's nucleus
+    stress = [0] * len(tokens)
+    pending = 0
+    for i, token in enumerate(tokens):
+        pending = max(pending, token.stress)
+        if _is_nucleus(token):
+            stress[i], pending = pending, 0
+    nuclei = [i for i, t in enumerate(tokens) if _is_nucleus(t)]
+    last = nuclei[-1] if nuclei else -1
+
+    def following(i: int) -> Formants:
+        for token in tokens[i + 1:]:
+            phone = PHONES[token.symbol]
+            if phone.kind in ("vowel", "approximant", "nasal"):
+                return phone.formants
+        return PHONES["ə"].formants
+
+    segs: List[Dict] = []
+
+    def add(ms, formants, voice=0.0, noise=None, level=0.0, end=None, nucleus=0):
+        segs.append({"ms": ms, "F": formants, "end": end or formants, "voice": voice,
+                     "noise": noise, "level": level, "stress": nucleus})
+
+    for i, token in enumerate(tokens):
+        phone, mods = PHONES[token.symbol], token.mods
+        voiced = phone.voiced and "devoiced" not in mods
+        ms = phone.ms * (1.6 if "long" in mods else 1.0)
+        if _is_nucleus(token):
+            ms *= (1.0, 1.15, 1.35)[stress[i]] * (1.3 if i == last else 1.0)  # phrase-final lengthening
+            if "syllabic" in mods:
+                ms *= 2.0
+        kind = phone.kind
+        if kind == "vowel":
+            add(ms, phone.formants, voice=(0.7, 0.85, 1.0)[stress[i]], end=phone.end, nucleus=stress[i])
+        elif kind in ("approximant", "nasal"):
+            level = 0.7 if kind == "approximant" else 0.45
+            if voiced:
+                add(ms, phone.formants, voice=level, nucleus=stress[i])
+            else:  # pl̥eɪ, kɹ̥im: breathy noise through the approximant's formants
+                add(ms, phone.formants, noise="formants", level=0.12)
+        elif kind == "tap":
+            add(ms, phone.formants, voice=0.3)
+        elif kind == "glottal":
+            add(ms, phone.formants)
+        elif kind in ("stop", "affricate"):
+            add(ms, phone.formants, voice=0.12 if voiced else 0.0)  # closure, voice bar if voiced
+            if kind == "affricate":
+                add(70 if voiced else 90, phone.formants, voice=0.4 if voiced else 0.0,
+                    noise=phone.noise[:2], level=phone.noise[2])
+            elif "unreleased" not in mods:
+                add(10, phone.formants, noise=phone.noise[:2], level=phone.noise[2])
+                if not voiced:  # voice onset time: long lag when aspirated
+                    vot = 55 if "aspirated" in mods else 15
+                    add(vot, following(i), noise="formants", level=0.14 if "aspirated" in mods else 0.06)
+        elif kind == "fricative":
+            if phone.noise is None:  # h
+                add(ms, following(i), noise="formants", level=0.12)
+            else:
+                add(ms, phone.formants, voice=0.45 if voiced else 0.0, noise=phone.noise[:2],
+                    level=phone.noise[2])
+    return segs
+
+
+def _envelope(freqs: np.ndarray, f1, f2, f3) -> np.ndarray:
+    """Cascade of second-order resonances at ``freqs`` (unit gain at 0 Hz)."""
+    gain = np.ones_like(freqs)
+    for centre, bandwidth in zip((f1, f2, f3, F4), BANDWIDTHS):
+        gain = gain * centre ** 2 / np.sqrt((centre ** 2 - freqs ** 2) ** 2 + (bandwidth * freqs) ** 2)
+    return gain
+
+
+def _smooth(track: np.ndarray, samplerate: int) -> np.ndarray:
+    width = max(3, int(samplerate * RAMP_MS / 1000))
+    kernel = np.hanning(width)
+    return np.convolve(track, kernel / kernel.sum(), mode="same")
+
+
+def render(ipa: str, samplerate: int = SAMPLE_RATE, f0: float = 120.0, seed: int = 0) -> np.ndarray:
+    """Float samples in [-1, 1] for ``ipa``; a short silence if nothing in it is known."""
+    tokens, _ = parse(ipa)
+    segs = _segments(tokens)
+    if not segs:
+        return np.zeros(int(0.3 * samplerate))
+    pad = int(0.05 * samplerate)
+    lengths = np.array([max(1, int(s["ms"] * samplerate / 1000)) for s in segs], dtype=int)
+    starts = pad + np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(int)
+    n = int(pad * 2 + lengths.sum())
+    t = np.arange(n)
+
+    # formant tracks: hold each target over the middle of its segment, glide in between
+    points = np.repeat(starts, 2) + (np.repeat(lengths, 2) * np.tile([0.2, 0.8], len(segs))).astype(int)
+    targets = np.array([f for s in segs for f in (s["F"], s["end"])], dtype=float)
+    f1, f2, f3 = (np.interp(t, points, targets[:, j]) for j in range(3))
+
+    voice = _smooth(np.concatenate([np.zeros(pad), np.repeat([s["voice"] for s in segs], lengths),
+                                    np.zeros(n - pad - lengths.sum())]), samplerate)
+
+    # pitch: gentle declination plus a rise on stressed syllables
+    pitch = np.linspace(f0 * 1.05, f0 * 0.82, n)
+    for s, start, length in zip(segs, starts, lengths):
+        if s["stress"]:
+            centre, width = start + length * 0.4, max(length, 1) * 0.6
+            pitch += (0, 0.1, 0.25)[s["stress"]] * f0 * np.exp(-0.5 * ((t - centre) / width) ** 2)
+
+    # voiced source through the filter: harmonics of f0 weighted by the formant envelope
+    harmonics = np.arange(1, int(samplerate / 2 / pitch.min()) + 1)[:, None]
+    freqs = harmonics * pitch[None, :]
+    amps = _envelope(freqs, f1, f2, f3) / harmonics * (freqs < samplerate / 2 - 200)
+    amps /= np.sqrt((amps ** 2).sum(axis=0, keepdims=True)) + 1e-12  # level is set by ``voice``
+    phase = 2 * np.pi * np.cumsum(pitch) / samplerate
+    voiced = (amps * np.sin(harmonics * phase[None, :])).sum(axis=0) * np.sqrt(2)
+
+    # frication, bursts and aspiration: white noise coloured per segment
+    rng = np.random.default_rng(seed)
+    noise = np.zeros(n)
+    for s, start, length in zip(segs, starts, lengths):
+        if not s["level"]:
+            continue
+        spectrum = np.fft.rfft(rng.standard_normal(length))
+        bins = np.fft.rfftfreq(length, 1 / samplerate)
+        if s["noise"] == "formants":
+            spectrum *= _envelope(bins, *s["F"])
+        else:
+            centre, bandwidth = s["noise"]
+            spectrum *= np.exp(-0.5 * ((bins - centre) / (bandwidth / 2)) ** 2)
+        shaped = np.fft.irfft(spectrum, length)
+        shaped /= np.sqrt(np.mean(shaped ** 2)) + 1e-12
+        noise[start:start + length] += s["level"] * shaped * np.hanning(length + 2)[1:-1] ** 0.5
+
+    out = voice * voiced + noise
+    peak = np.abs(out).max()
+    return out * (0.8 / peak) if peak > 0 else out
+
+
+def to_wav(samples: np.ndarray, samplerate: int = SAMPLE_RATE) -> bytes:
+    data = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    bio = io.BytesIO()
+    with wave.open(bio, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(samplerate)
+        wf.writeframes(data.tobytes())
+    return bio.getvalue()
+
+
+def wav_bytes(ipa: str, samplerate: int = SAMPLE_RATE) -> bytes:
+    """WAV of ``ipa``, rendered once per process."""
+    return FORMANT_STORE.get_or_load((ipa.strip(), samplerate), lambda: to_wav(render(ipa, samplerate), samplerate))
+
+
+# ---------------- Batch CLI ----------------
+def _safe_name(text: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in text.strip()) or "item"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Render IPA transcriptions to WAV with the formant synthesizer.")
+    parser.add_argument("source", help="an IPA string, or a CSV file to render a column of")
+    parser.add_argument("--column", default="Phonetic Transcription", help="CSV column with the transcriptions")
+    parser.add_argument("--name-column", default="Word", help="CSV column used for file names")
+    parser.add_argument("--out", type=Path, default=Path("."), help="output folder for a CSV")
+    parser.add_argument("-o", "--output", type=Path, help="output file for a single string")
+    parser.add_argument("--rate", type=int, default=SAMPLE_RATE, help=f"sample rate (default {SAMPLE_RATE})")
+    args = parser.parse_args(argv)
+
+    if not args.source.lower().endswith(".csv"):
+        _, skipped = parse(args.source)
+        if skipped:
+            print(f"skipped unknown symbols: {' '.join(skipped)}")
+        output = args.output or Path(f"{_safe_name(args.source)}.wav")
+        output.write_bytes(to_wav(render(args.source, args.rate), args.rate))
+        print(f"wrote {output}")
+        return 0
+
+    with open(args.source, encoding="utf-8-sig", newline="") as f:
+        rows = [{k.strip(): (v or "") for k, v in row.items() if k} for row in csv.DictReader(f)]
+    if rows and args.column not in rows[0]:
+        parser.error(f"no column {args.column!r} in {args.source}")
+    args.out.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    seconds = 0.0
+    for i, row in enumerate(rows, start=1):
+        ipa = row[args.column]
+        samples = render(ipa, args.rate)
+        seconds += len(samples) / args.rate
+        _, skipped = parse(ipa)
+        name = _safe_name(row.get(args.name_column) or f"{i:03d}")
+        (args.out / f"{name}.wav").write_bytes(to_wav(samples, args.rate))
+        if skipped:
+            print(f"  {name}: skipped {' '.join(skipped)}")
+    elapsed = time.perf_counter() - start
+    print(f"{len(rows)} clips ({seconds:.1f} s of audio) in {elapsed * 1000:.0f} ms "
+          f"-> {args.out} ({elapsed * 1000 / max(1, len(rows)):.1f} ms per clip)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
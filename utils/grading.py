@@ -0,0 +1,137 @@
+"""Answer normalisation and grading shared by the practice pages.
+
+Pure functions (no Streamlit), so they can be benchmarked and reused:
+``benchmarks/bench_grading.py`` times them on synthetic inputs.  Each one
+keeps the behaviour of the page code it came from; the speedups come from
+single-pass ``str.translate`` tables, precompiled patterns and, for the
+feature tables, one array comparison instead of per-cell ``.loc`` lookups.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ---------------- Transcription (22 Transcription) ----------------
+# brackets/whitespace, stress and length marks go; ʤ and ASCII g are unified
+_TRANSCRIPTION_TABLE = str.maketrans(
+    {**{ch: None for ch in "/[](){} \t\n\rˈˌː:"}, "ʤ": "dʒ", "g": "ɡ"}
+)
+
+
+def normalize_word(s: str) -> str:
+    if not s:
+        return ""
+    s = s.strip().lower()
+    # five replace() calls beat translate() on strings this short
+    for ch in " -_'’":
+        s = s.replace(ch, "")
+    return s
+
+
+def compare_word(user_word: str, target_word: str) -> bool:
+    return normalize_word(user_word) == normalize_word(target_word)
+
+
+def normalize_transcription(s: str) -> str:
+    """
+    Normalization applied to both modes:
+    - NFKC
+    - remove slashes/brackets/whitespace
+    - remove stress (ˈ, ˌ) & length (ː, :)
+    - unify affricates: ʤ->dʒ, t͡ʃ->tʃ
+    - ASCII g -> IPA ɡ
+    (Other diacritics are left intact for phonetic detail.)
+    """
+    if not s:
+        return ""
+    s = unicodedata.normalize("NFKC", s).translate(_TRANSCRIPTION_TABLE)
+    if "͡" in s:
+        s = s.replace("t͡ʃ", "tʃ")
+    return s
+
+
+def compare_transcription(user_input: str, target_str: str) -> bool:
+    return normalize_transcription(user_input) == normalize_transcription(target_str)
+
+
+# ---------------- Short answers (vocal anatomy) ----------------
+# one pass: -_/ become spaces, everything else that is not a-z or whitespace goes
+_ANSWER_TABLE = str.maketrans(
+    {**{chr(c): None for c in range(128) if not (chr(c).islower() or chr(c).isspace())},
+     "-": " ", "_": " ", "/": " "}
+)
+
+
+def normalize_answer(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+    return " ".join(s.lower().translate(_ANSWER_TABLE).split())
+
+
+@lru_cache(maxsize=1024)
+def _gold(answers: Tuple[str, ...]) -> FrozenSet[str]:
+    return frozenset(normalize_answer(x) for x in answers)
+
+
+def is_accepted(user_text: str, answers: Sequence[str]) -> bool:
+    """True if ``user_text`` matches one of ``answers``, allowing a plural/singular slip."""
+    if not user_text:
+        return False
+    gold = _gold(tuple(answers))
+    guess = normalize_answer(user_text)
+    return guess in gold or (guess.endswith("s") and guess[:-1] in gold) or ((guess + "s") in gold)
+
+
+# ---------------- Passages with blanks (5 Keyword Reading) ----------------
+BLANK10_HTML = '<span style="font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace;">__________</span>'
+
+_NOT_WORD = re.compile(r"[^a-zA-Z'\s]+")
+_BLANK = re.compile(r"_{2,}")
+
+
+def normalize_text(s: str) -> str:
+    """Lowercase + keep letters/apostrophes + single-space."""
+    return " ".join(_NOT_WORD.sub(" ", str(s).strip().lower()).split())
+
+
+def render_passage_with_numbered_blanks(passage: str, correct_items: List[List[str]]) -> str:
+    replacements = [f"<b>({i})</b> " + " ".join([BLANK10_HTML] * max(1, len(words)))
+                    for i, words in enumerate(correct_items, start=1)]
+    numbered = iter(replacements)
+    out = _BLANK.sub(lambda m: next(numbered, BLANK10_HTML), str(passage))
+    return out.replace("\n", "<br>")
+
+
+# ---------------- Feature tables (sound description) ----------------
+# pandas/numpy are imported in the functions: the other pages using this module
+# do not need them, and they cost half a second at import.
+def compute_wrong_mask_and_feedback(df_user: "pd.DataFrame", df_ans: "pd.DataFrame", features: Sequence[str]):
+    """Cells of ``df_user`` that differ from ``df_ans`` in ``features``, plus one feedback line per wrong row."""
+    import numpy as np
+    import pandas as pd
+
+    features = list(features)
+    user = df_user[features].to_numpy()
+    ans = df_ans[features].to_numpy()
+    wrong = user != ans
+
+    wrong_mask = pd.DataFrame(False, index=df_user.index, columns=df_user.columns)
+    wrong_mask[features] = wrong
+
+    symbols = df_user["IPA"].to_numpy()
+    feedback_lines = []
+    for i in np.flatnonzero(wrong.any(axis=1)):
+        detail = ", ".join(f"{features[j]}: expected {ans[i, j]} / got {user[i, j]}"
+                           for j in np.flatnonzero(wrong[i]))
+        feedback_lines.append(f"• {symbols[i]} — {detail}")
+    return wrong_mask, feedback_lines
+
+
+def answer_frame(answer_key: Dict[str, Dict[str, str]], symbols: Sequence[str],
+                 features: Sequence[str]) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.DataFrame([{"IPA": sym, **answer_key[sym]} for sym in symbols], columns=["IPA", *features])
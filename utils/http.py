@@ -0,0 +1,181 @@
+"""The one HTTP client for remote content (GitHub raw files, Google Sheets, ...).
+
+* a pooled keep-alive session per process, with retries on connection errors
+  and 429/5xx responses, and the same timeouts everywhere;
+* an on-disk cache in ``.cache/http``: a copy younger than ``FRESH_SECONDS``
+  is used as is, an older one is revalidated with ``If-None-Match`` /
+  ``If-Modified-Since``, so a restart does not re-download unchanged files;
+* if revalidation fails or is slow, the stale copy is served instead;
+* concurrent fetches of the same URL wait on one request
+  (``utils.singleflight``).
+
+    data = fetch(url)         # bytes
+    if exists(url): ...       # HEAD probe
+
+With ``PHONETICS_OFFLINE=1`` nothing goes to the network: URLs are served
+from the snapshot bundle built by ``python -m utils.snapshot`` (then from the
+disk cache), and anything missing from both raises ``OfflineError``.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.singleflight import flight
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = REPO_ROOT / ".cache" / "http"
+SNAPSHOT_DIR = Path(os.environ.get("PHONETICS_SNAPSHOT_DIR", REPO_ROOT / "snapshot"))
+SNAPSHOT_INDEX = "index.json"
+OFFLINE = os.environ.get("PHONETICS_OFFLINE", "").lower() not in ("", "0", "false", "no")
+
+TIMEOUT = (5, 20)              # (connect, read) seconds
+REVALIDATE_TIMEOUT = (3, 5)    # when a cached copy can be served instead
+RETRIES = 2
+POOL_SIZE = 16
+FRESH_SECONDS = 300
+
+log = logging.getLogger(__name__)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+FETCH_FLIGHT = flight("http")
+
+
+class OfflineError(requests.ConnectionError):
+    """Offline mode and the URL is in neither the snapshot nor the disk cache."""
+
+
+def session() -> requests.Session:
+    """One keep-alive session per process, shared by every page and thread."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            retry = Retry(total=RETRIES, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET", "HEAD"), raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def exists(url: str, timeout=TIMEOUT) -> bool:
+    if OFFLINE:
+        return snapshot_file(url) is not None or _read_cached(url)[0] is not None
+    try:
+        r = session().head(url, timeout=timeout, allow_redirects=True)
+        return r.status_code == 200
+    except requests.RequestException:
+        return False
+
+
+# ---------------- Snapshot bundle ----------------
+@lru_cache(maxsize=4)
+def _snapshot_index(path: str, mtime_ns: int) -> Dict:
+    return json.loads(Path(path).read_text(encoding="utf-8")).get("urls", {})
+
+
+def snapshot_file(url: str) -> Optional[Path]:
+    """The bundled copy of ``url`` from ``python -m utils.snapshot``, if there is one."""
+    index_path = SNAPSHOT_DIR / SNAPSHOT_INDEX
+    try:
+        index = _snapshot_index(str(index_path), index_path.stat().st_mtime_ns)
+    except (OSError, ValueError):
+        return None
+    entry = index.get(url)
+    if entry is None:
+        return None
+    path = SNAPSHOT_DIR / entry["file"]
+    return path if path.is_file() else None
+
+
+# ---------------- Disk cache ----------------
+def _cache_paths(url: str):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{key}.body", CACHE_DIR / f"{key}.json"
+
+
+def _read_cached(url: str):
+    body_path, meta_path = _cache_paths(url)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return body_path.read_bytes(), meta
+    except (OSError, ValueError):
+        return None, None
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _store(url: str, body: Optional[bytes], meta: Dict) -> None:
+    body_path, meta_path = _cache_paths(url)
+    try:
+        if body is not None:
+            _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError as e:
+        log.warning("http cache: could not write %s: %s", url, e)
+
+
+def fetch(url: str, fresh_seconds: int = FRESH_SECONDS) -> bytes:
+    """Body of ``url``, through the disk cache.  Raises if there is no copy at all.
+
+    Concurrent fetches of one URL (CSV loads, slides) share a single request.
+    """
+    return FETCH_FLIGHT.do(url, lambda: _fetch(url, fresh_seconds))
+
+
+def _fetch(url: str, fresh_seconds: int) -> bytes:
+    if OFFLINE:
+        bundled = snapshot_file(url)
+        if bundled is not None:
+            return bundled.read_bytes()
+    body, meta = _read_cached(url)
+    if OFFLINE:
+        if body is None:
+            raise OfflineError(f"offline and not in the snapshot: {url}")
+        return body
+    if body is not None and time.time() - meta.get("checked", 0) < fresh_seconds:
+        return body
+
+    headers = {}
+    if body is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        r = session().get(url, headers=headers, timeout=REVALIDATE_TIMEOUT if body is not None else TIMEOUT)
+        if r.status_code == 304 and body is not None:
+            meta["checked"] = time.time()
+            _store(url, None, meta)
+            return body
+        r.raise_for_status()
+    except requests.RequestException as e:
+        if body is None:
+            raise
+        log.warning("http cache: serving stale %s (%s)", url, e)
+        return body
+
+    _store(url, r.content, {
+        "url": url,
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "checked": time.time(),
+    })
+    return r.content
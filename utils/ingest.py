@@ -0,0 +1,153 @@
+"""Rasterize a PDF lecture deck into slide images for the players.
+
+Page ``n`` of the PDF becomes ``<prefix><NNN>.png`` in the deck folder
+(numbering starts at ``--start``, zero-padded to ``--digits``), which is the
+scheme ``utils.slide_player.DECKS`` expects::
+
+    python -m utils.ingest data/S26_Ch02_topost.pdf pages/lecture/Ch02 --prefix F25_Ch02_only.
+
+Pages are rendered by a process pool.  Each page's fingerprint (content
+stream, Form XObjects, images, fonts, geometry and output width) is stored
+in the deck manifest under ``"source"``; on the next run only pages whose
+fingerprint changed are rendered again.  Slides past the end of a shorter PDF are
+removed, then the manifest and thumbnails are refreshed.
+
+Needs PyMuPDF (``pip install pymupdf``), which is only used here and is not
+part of the app's requirements.
+"""
+import argparse
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.slides import (
+    MANIFEST_NAME,
+    REPO_ROOT,
+    _slide_index,
+    build_manifest,
+    load_manifest,
+    slide_files,
+    write_manifest,
+)
+from utils.thumbnails import build_thumbnails
+
+SLIDE_WIDTH = 1024
+INDEX_DIGITS = 3
+
+_doc = None  # the PDF opened once per worker process
+
+
+def _pymupdf():
+    try:
+        import pymupdf
+    except ImportError:
+        raise SystemExit("utils.ingest needs PyMuPDF: pip install pymupdf")
+    return pymupdf
+
+
+def slide_name(prefix: str, number: int, digits: int = INDEX_DIGITS, ext: str = ".png") -> str:
+    return f"{prefix}{number:0{digits}d}{ext}"
+
+
+def page_fingerprint(doc, page_no: int, width: int) -> str:
+    """Hash of everything that affects how page ``page_no`` renders at ``width`` px."""
+    page = doc[page_no]
+    h = hashlib.sha256()
+    h.update(f"{width}|{tuple(page.rect)}|{page.rotation}|".encode())
+    h.update(page.read_contents())
+    for xobj in page.get_xobjects():  # Form XObjects: their own content streams
+        h.update(hashlib.sha256(doc.xref_stream_raw(xobj[0]) or b"").digest())
+    for img in page.get_images(full=True):
+        h.update(hashlib.sha256(doc.xref_stream_raw(img[0]) or b"").digest())
+    for font in page.get_fonts(full=True):
+        h.update(f"|{font[3]}|{font[1]}".encode())
+    return h.hexdigest()
+
+
+def _open_worker(pdf_path: str) -> None:
+    global _doc
+    _doc = _pymupdf().open(pdf_path)
+
+
+def _render_page(task: Tuple[int, int, str]) -> str:
+    page_no, width, target = task
+    page = _doc[page_no]
+    zoom = width / page.rect.width
+    pix = page.get_pixmap(matrix=_pymupdf().Matrix(zoom, zoom), alpha=False)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    Path(tmp).write_bytes(pix.tobytes("png"))
+    os.replace(tmp, target)
+    return target
+
+
+def ingest_pdf(pdf: Path, deck_dir: Path, prefix: str, start: int = 1, digits: int = INDEX_DIGITS,
+               width: int = SLIDE_WIDTH, workers: Optional[int] = None,
+               force: bool = False) -> Tuple[int, int, int]:
+    """Render changed pages of ``pdf`` into ``deck_dir``; returns (rendered, kept, removed)."""
+    pymupdf = _pymupdf()
+    deck_dir.mkdir(parents=True, exist_ok=True)
+    folder_path = deck_dir.resolve().relative_to(REPO_ROOT).as_posix()
+    pdf_path = pdf.resolve()
+    source_pdf = pdf_path.relative_to(REPO_ROOT).as_posix() if REPO_ROOT in pdf_path.parents else str(pdf)
+    old = (load_manifest(folder_path) or {}).get("source") or {}
+    old_pages: Dict[str, str] = old.get("pages", {})
+
+    with pymupdf.open(pdf) as doc:
+        fingerprints = {
+            slide_name(prefix, start + i, digits): page_fingerprint(doc, i, width)
+            for i in range(doc.page_count)
+        }
+
+    tasks: List[Tuple[int, int, str]] = []
+    for i, (name, fp) in enumerate(fingerprints.items()):
+        target = deck_dir / name
+        if force or old_pages.get(name) != fp or not target.exists():
+            tasks.append((i, width, str(target)))
+    if tasks:
+        workers = workers or min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker,
+                                 initargs=(str(pdf),)) as pool:
+            for target in pool.map(_render_page, tasks, chunksize=4):
+                print(f"  rendered {Path(target).name}")
+
+    removed = 0
+    for path in slide_files(deck_dir):
+        if _slide_index(path.name, prefix, ".png") is not None and path.name not in fingerprints:
+            path.unlink()
+            removed += 1
+
+    manifest = build_manifest(deck_dir)
+    manifest["source"] = {
+        "pdf": source_pdf,  # repo-relative when the PDF is in the checkout
+        "width": width,
+        "pages": fingerprints,
+    }
+    write_manifest(deck_dir, manifest)
+    build_thumbnails(deck_dir, manifest)
+    return len(tasks), len(fingerprints) - len(tasks), removed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rasterize a PDF deck into lecture slide images.")
+    parser.add_argument("pdf", type=Path, help="the PDF deck, e.g. data/S26_Ch02_topost.pdf")
+    parser.add_argument("deck", type=Path, help="deck folder, e.g. pages/lecture/Ch02")
+    parser.add_argument("--prefix", required=True, help="slide name prefix, e.g. 'F25_Ch02_only.'")
+    parser.add_argument("--start", type=int, default=1, help="number of the first slide (default 1)")
+    parser.add_argument("--digits", type=int, default=INDEX_DIGITS, help="zero-padding of slide numbers")
+    parser.add_argument("--width", type=int, default=SLIDE_WIDTH, help="slide width in pixels")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="re-render every page")
+    args = parser.parse_args(argv)
+
+    rendered, kept, removed = ingest_pdf(args.pdf, args.deck, args.prefix, start=args.start,
+                                         digits=args.digits, width=args.width,
+                                         workers=args.workers, force=args.force)
+    print(f"ingest {args.deck / MANIFEST_NAME}: {rendered} rendered, {kept} unchanged, {removed} removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Deferred imports for heavy optional modules.
+
+Streamlit runs a page top to bottom on every rerun, and everything above the
+first ``st.*`` call delays the first paint.  A lazy module imports on first
+attribute access instead, i.e. when the tab or button that needs it runs::
+
+    from utils.lazy import lazy_import
+
+    qrcode = lazy_import("qrcode")            # nothing imported yet
+    gtts = lazy_import("gtts")
+    ...
+    if st.button("Generate"):
+        qr = qrcode.QRCode(...)                # imported here, once per process
+
+Submodules work the same way (``lazy_import("librosa.display")``).
+"""
+import importlib
+import sys
+import threading
+import types
+
+_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """The module ``name`` if it is already imported, else a lazy stand-in for it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
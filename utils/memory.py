@@ -0,0 +1,128 @@
+"""Session-state memory accounting.
+
+Measures the deep size of every live session's ``st.session_state`` grouped
+by key prefix (the key up to its first ``_``, so ``quiz_answers`` and
+``quiz_order`` count as ``quiz``, ``ch02_slide_idx`` as ``ch02``), and totals
+across sessions.  Sessions over ``SESSION_BUDGET_MB``
+(``PHONETICS_SESSION_BUDGET_MB``) are flagged and logged.  The admin view
+shows the report; nothing here runs on the normal page path.
+
+Sizes are approximate: containers are walked recursively, DataFrames use
+``memory_usage(deep=True)``, arrays ``nbytes``, and an object reachable from
+two keys of one session is counted once, under the first.
+"""
+import logging
+import os
+import re
+import sys
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+SESSION_BUDGET_MB = float(os.environ.get("PHONETICS_SESSION_BUDGET_MB", 64))
+
+_log = logging.getLogger("phonetics.memory")
+_ATOMIC = (str, bytes, bytearray, int, float, complex, bool, type(None))
+_OPAQUE = (type, type(sys), type(len), type(lambda: None))  # classes, modules, functions: shared
+_PREFIX_SPLIT = re.compile(r"[_\-.]")
+
+
+def deep_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Approximate bytes held by ``obj`` and everything it references."""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _OPAQUE):
+            continue
+        seen.add(id(o))
+        if isinstance(o, _ATOMIC):
+            total += sys.getsizeof(o)
+            continue
+        module = type(o).__module__
+        if module.startswith("pandas") and hasattr(o, "memory_usage"):
+            usage = o.memory_usage(deep=True)
+            total += int(usage.sum() if hasattr(usage, "sum") else usage)  # DataFrame vs Series
+            continue
+        if module.startswith("numpy") and hasattr(o, "nbytes"):
+            total += sys.getsizeof(o) if getattr(o, "base", None) is None else int(o.nbytes)
+            continue
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        else:
+            attrs = getattr(o, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+def key_prefix(key: str) -> str:
+    return _PREFIX_SPLIT.split(str(key), 1)[0] or str(key)
+
+
+def _snapshot(state) -> Dict[str, Any]:
+    # the session's script thread may be writing; retry a couple of times
+    for _ in range(3):
+        try:
+            if hasattr(state, "filtered_state"):  # SessionState: user keys only, no widget ids
+                return dict(state.filtered_state)
+            return state.to_dict() if hasattr(state, "to_dict") else dict(state)
+        except RuntimeError:
+            continue
+    return {}
+
+
+def footprint(state: Mapping) -> Dict[str, int]:
+    """Bytes per key prefix for one session's state."""
+    seen: Set[int] = set()
+    sizes: Dict[str, int] = {}
+    for key, value in sorted(_snapshot(state).items(), key=lambda kv: str(kv[0])):
+        prefix = key_prefix(key)
+        sizes[prefix] = sizes.get(prefix, 0) + deep_size(value, seen)
+    return sizes
+
+
+def live_sessions() -> List[Tuple[str, Any]]:
+    """(session id, SessionState) for every connected session on this server."""
+    try:
+        from streamlit.runtime import Runtime
+
+        infos = Runtime.instance()._session_mgr.list_active_sessions()
+    except Exception:  # bare mode, or a test runtime without a session manager
+        return []
+    return [(info.session.id, info.session.session_state) for info in infos]
+
+
+def report(sessions: Optional[List[Tuple[str, Any]]] = None,
+           budget_mb: float = SESSION_BUDGET_MB) -> Dict[str, List[Dict]]:
+    """Per-session totals (largest first) and per-prefix totals across sessions."""
+    sessions = live_sessions() if sessions is None else sessions
+    rows, prefixes = [], {}
+    for session_id, state in sessions:
+        sizes = footprint(state)
+        total = sum(sizes.values())
+        top = sorted(sizes.items(), key=lambda kv: -kv[1])[:3]
+        rows.append({
+            "session": session_id[:8],
+            "MB": round(total / 2**20, 2),
+            "largest": ", ".join(f"{p} {b / 2**20:.1f}" for p, b in top),
+            "over budget": total > budget_mb * 2**20,
+        })
+        for prefix, size in sizes.items():
+            entry = prefixes.setdefault(prefix, {"prefix": prefix, "sessions": 0, "bytes": 0, "max": 0})
+            entry["sessions"] += 1
+            entry["bytes"] += size
+            entry["max"] = max(entry["max"], size)
+    over = [r["session"] for r in rows if r["over budget"]]
+    if over:
+        _log.warning("%d session(s) over %.0f MB: %s", len(over), budget_mb, ", ".join(over))
+    totals = [{"prefix": e["prefix"], "sessions": e["sessions"], "MB": round(e["bytes"] / 2**20, 2),
+               "max MB": round(e["max"] / 2**20, 2)}
+              for e in sorted(prefixes.values(), key=lambda e: -e["bytes"])]
+    return {"sessions": sorted(rows, key=lambda r: -r["MB"]), "prefixes": totals}
@@ -0,0 +1,149 @@
+"""Full-size recompressed copies of the lecture slides.
+
+The PNGs under ``pages/lecture`` stay the source of truth.  This tool encodes
+each one at full size as
+
+* ``webp`` -- lossless (bit-exact pixels), served by the players, and
+* ``avif`` -- visually lossless (4:4:4, quality 100), built on request,
+
+under ``static/lecture/<deck>/full/<sha256[:16]>.<fmt>`` and records the
+per-deck byte savings in ``static/lecture/savings.json``::
+
+    python -m utils.recompress                  # webp for every deck
+    python -m utils.recompress --formats webp avif
+
+JPEG sources are already lossy, so they are re-encoded at quality 90 instead
+of losslessly.  A copy that is missing at request time is queued on the
+renditions background builder and the PNG is served meanwhile.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.renditions import STATIC_DIR, _write, build_later
+from utils.slides import REPO_ROOT, build_manifest, deck_dirs, load_manifest
+
+FULL_FORMATS = ("webp", "avif")
+SERVED_FORMAT = "webp"
+SAVINGS_FILE = STATIC_DIR / "lecture" / "savings.json"
+
+
+def full_path(folder_path: str, sha256: str, fmt: str = SERVED_FORMAT) -> Path:
+    deck = Path(folder_path).name
+    return STATIC_DIR / "lecture" / deck / "full" / f"{sha256[:16]}.{fmt}"
+
+
+def encode_full(raw: bytes, fmt: str = SERVED_FORMAT) -> bytes:
+    from PIL import Image
+
+    im = Image.open(io.BytesIO(raw))
+    lossless = im.format == "PNG"
+    if im.mode in ("RGBA", "LA", "P"):
+        im = im.convert("RGBA")
+        bg = Image.new("RGB", im.size, (255, 255, 255))
+        bg.paste(im, mask=im.split()[-1])
+        im = bg
+    else:
+        im = im.convert("RGB")
+    buf = io.BytesIO()
+    if fmt == "webp":
+        if lossless:
+            im.save(buf, format="WEBP", lossless=True, quality=50, method=4)
+        else:
+            im.save(buf, format="WEBP", quality=90, method=4)
+    elif fmt == "avif":
+        im.save(buf, format="AVIF", quality=100 if lossless else 90, subsampling="4:4:4", speed=6)
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+    return buf.getvalue()
+
+
+def ready_full(folder_path: str, entry: Dict, fmt: str = SERVED_FORMAT) -> Optional[Path]:
+    """The full-size copy if it has been built; otherwise queue it and return None."""
+    target = full_path(folder_path, entry["sha256"], fmt)
+    if target.exists():
+        return target
+    source = REPO_ROOT / folder_path / entry["name"]
+    build_later(target, lambda: encode_full(source.read_bytes(), fmt))
+    return None
+
+
+# ---------------- Build ----------------
+def _encode_task(task: Tuple[str, str, str]) -> str:
+    source, target, fmt = task
+    _write(Path(target), encode_full(Path(source).read_bytes(), fmt))
+    return target
+
+
+def build_full(deck_dir: Path, formats: Sequence[str] = (SERVED_FORMAT,), force: bool = False,
+               workers: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+    """Encode a deck's full-size copies; returns per-format byte totals and counts."""
+    folder_path = deck_dir.resolve().relative_to(REPO_ROOT).as_posix()
+    manifest = load_manifest(folder_path) or build_manifest(deck_dir)
+    tasks: List[Tuple[str, str, str]] = []
+    wanted = set()
+    for entry in manifest["slides"]:
+        for fmt in formats:
+            target = full_path(folder_path, entry["sha256"], fmt)
+            wanted.add(target)
+            if force or not target.exists():
+                tasks.append((str(deck_dir / entry["name"]), str(target), fmt))
+    if tasks:
+        workers = workers or min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_encode_task, tasks, chunksize=4))
+
+    removed = 0
+    for stale in (STATIC_DIR / "lecture" / deck_dir.name / "full").glob("*.*"):
+        if stale.suffix[1:] in formats and stale not in wanted:
+            stale.unlink()
+            removed += 1
+
+    totals = {"original": {"bytes": sum(e["bytes"] for e in manifest["slides"]),
+                           "files": len(manifest["slides"])}}
+    for fmt in formats:
+        paths = [full_path(folder_path, e["sha256"], fmt) for e in manifest["slides"]]
+        totals[fmt] = {"bytes": sum(p.stat().st_size for p in paths), "files": len(paths)}
+    totals["encoded"] = len(tasks)
+    totals["removed"] = removed
+    return totals
+
+
+def record_savings(deck: str, totals: Dict) -> None:
+    try:
+        savings = json.loads(SAVINGS_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        savings = {}
+    savings[deck] = {k: v for k, v in totals.items() if isinstance(v, dict)}
+    _write(SAVINGS_FILE, (json.dumps(savings, indent=1, sort_keys=True) + "\n").encode("utf-8"))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Recompress lecture slides to full-size WEBP/AVIF.")
+    parser.add_argument("decks", nargs="*", type=Path,
+                        help="deck folders (default: every deck under pages/lecture)")
+    parser.add_argument("--formats", nargs="+", choices=FULL_FORMATS, default=[SERVED_FORMAT])
+    parser.add_argument("--force", action="store_true", help="re-encode copies that already exist")
+    parser.add_argument("--workers", type=int, help="encoder processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    for deck in args.decks or deck_dirs():
+        totals = build_full(deck, args.formats, force=args.force, workers=args.workers)
+        record_savings(deck.name, totals)
+        original = totals["original"]["bytes"]
+        sizes = ", ".join(
+            f"{fmt} {totals[fmt]['bytes'] / 2**20:.1f} MB ({1 - totals[fmt]['bytes'] / original:.0%} saved)"
+            for fmt in args.formats
+        )
+        print(f"full {deck.name}: png {original / 2**20:.1f} MB -> {sizes}; "
+              f"{totals['encoded']} encoded, {totals['removed']} removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Multi-resolution slide renditions.
+
+Every slide is pre-rendered as WEBP at a few widths (never wider than the
+source) under ``static/lecture/<deck>/w<width>/<sha256[:16]>.webp``.  The
+players pick the smallest rendition that covers the on-screen size implied by
+the current ``fit_to_height`` / ``vh_percent`` / ``display_width_px`` state.
+At the source width they get the lossless full-size copy from
+``utils.recompress`` instead of a lossy one.
+
+``static/`` is served by Streamlit (``enableStaticServing`` in
+``.streamlit/config.toml``), so the ``<img>`` mode can point the browser at
+``app/static/...`` instead of the full-size PNG on GitHub.  Build them at
+deploy time with::
+
+    python -m utils.renditions && python -m utils.recompress
+
+A request never waits for an encode: a missing rendition is queued on a
+background builder and the original slide is served until it exists.
+"""
+import argparse
+import io
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from utils.assets import asset_source, read_local
+from utils.slides import REPO_ROOT, build_manifest, deck_dirs, load_manifest, manifest_entry
+
+RENDITION_WIDTHS = (480, 960, 1440)
+RENDITION_QUALITY = 80
+STATIC_DIR = REPO_ROOT / "static"
+STATIC_URL = "app/static"
+
+# Assumed CSS viewport when the browser does not tell us (desktop / phone).
+DESKTOP_VIEWPORT = (1920, 1080)
+MOBILE_VIEWPORT = (430, 900)
+
+log = logging.getLogger(__name__)
+
+# One encoder thread: missing files are built off the request path, one at a time.
+_build_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="renditions")
+_build_lock = threading.Lock()
+_building: Set[Path] = set()
+_failed: Set[Path] = set()  # not retried until restart; the original keeps being served
+
+
+def widths_for(src_width: int) -> List[int]:
+    return sorted({min(w, src_width) for w in RENDITION_WIDTHS})
+
+
+def rendition_path(folder_path: str, sha256: str, width: int) -> Path:
+    deck = Path(folder_path).name
+    return STATIC_DIR / "lecture" / deck / f"w{width}" / f"{sha256[:16]}.webp"
+
+
+def static_url(path: Path) -> str:
+    return f"{STATIC_URL}/{path.relative_to(STATIC_DIR).as_posix()}"
+
+
+def render_rendition(raw: bytes, width: int) -> bytes:
+    from PIL import Image
+
+    im = Image.open(io.BytesIO(raw))
+    if im.mode in ("RGBA", "LA", "P"):
+        im = im.convert("RGBA")
+        bg = Image.new("RGB", im.size, (255, 255, 255))
+        bg.paste(im, mask=im.split()[-1])
+        im = bg
+    else:
+        im = im.convert("RGB")
+    if im.width > width:
+        im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+    buf = io.BytesIO()
+    im.save(buf, format="WEBP", quality=RENDITION_QUALITY, method=4)
+    return buf.getvalue()
+
+
+def _write(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+
+
+def _build(target: Path, encode: Callable[[], bytes]) -> None:
+    try:
+        if not target.exists():
+            _write(target, encode())
+    except Exception as e:  # a bad source must not kill the builder thread
+        log.warning("renditions: could not build %s: %s", target, e)
+        with _build_lock:
+            _failed.add(target)
+    finally:
+        with _build_lock:
+            _building.discard(target)
+
+
+def build_later(target: Path, encode: Callable[[], bytes]) -> None:
+    """Write ``encode()`` to ``target`` on the background builder (once, however often asked)."""
+    with _build_lock:
+        if target in _building or target in _failed:
+            return
+        _building.add(target)
+    _build_pool.submit(_build, target, encode)
+
+
+def ready_rendition(folder_path: str, entry: Dict, width: int) -> Optional[Path]:
+    """The rendition if it has been built; otherwise queue it and return None."""
+    if width >= entry["width"]:
+        from utils.recompress import ready_full
+
+        return ready_full(folder_path, entry)
+    target = rendition_path(folder_path, entry["sha256"], width)
+    if target.exists():
+        return target
+    source = REPO_ROOT / folder_path / entry["name"]
+    build_later(target, lambda: render_rendition(source.read_bytes(), width))
+    return None
+
+
+# ---------------- Choosing a width ----------------
+def viewport_hint() -> Tuple[int, int]:
+    """Rough CSS viewport of the current browser, from its User-Agent.
+
+    Call it from the script thread; background threads have no request context.
+    """
+    try:
+        import streamlit as st
+
+        agent = st.context.headers.get("User-Agent", "")
+    except Exception:
+        agent = ""
+    return MOBILE_VIEWPORT if "Mobi" in agent else DESKTOP_VIEWPORT
+
+
+def choose_width(src_width: int, src_height: int, fit_to_height: bool, vh_percent: int,
+                 display_width_px: int, viewport: Optional[Tuple[int, int]] = None) -> int:
+    """Smallest rendition width that covers the slide's displayed width."""
+    vw, vh = viewport or viewport_hint()
+    if fit_to_height:
+        needed = vh * vh_percent / 100 * src_width / src_height
+    else:
+        needed = display_width_px
+    needed = min(needed, vw)
+    widths = widths_for(src_width)
+    return next((w for w in widths if w >= needed), widths[-1])
+
+
+def pick_rendition(folder_path: str, name: str, fit_to_height: bool, vh_percent: int,
+                   display_width_px: int, viewport: Optional[Tuple[int, int]] = None) -> Optional[Path]:
+    """Rendition file for a slide at the current display settings.
+
+    None if the slide is not in the manifest or its rendition is still being built.
+    """
+    entry = manifest_entry(folder_path, name)
+    if entry is None:
+        return None
+    width = choose_width(entry["width"], entry["height"], fit_to_height, vh_percent, display_width_px, viewport)
+    try:
+        return ready_rendition(folder_path, entry, width)
+    except OSError:
+        return None
+
+
+def slide_src(folder_path: str, url: str, fit_to_height: bool, vh_percent: int,
+              display_width_px: int, viewport: Optional[Tuple[int, int]] = None) -> str:
+    """URL for an <img> tag: the static rendition, or the original URL until it is built.
+
+    (Not ``asset_source``: a local file path means nothing to the browser.)
+    """
+    path = pick_rendition(folder_path, url.rsplit("/", 1)[-1], fit_to_height, vh_percent,
+                          display_width_px, viewport)
+    return static_url(path) if path is not None else url
+
+
+def slide_image(folder_path: str, url: str, fit_to_height: bool, vh_percent: int,
+                display_width_px: int, viewport: Optional[Tuple[int, int]] = None):
+    """Bytes of the rendition for st.image, or the original slide until it is built."""
+    path = pick_rendition(folder_path, url.rsplit("/", 1)[-1], fit_to_height, vh_percent,
+                          display_width_px, viewport)
+    return read_local(path) if path is not None else asset_source(url)
+
+
+# ---------------- Build ----------------
+def build_renditions(deck_dir: Path, force: bool = False) -> Tuple[int, int, int]:
+    """Render every downscaled width for a deck; returns (built, kept, removed).
+
+    The source-width copy is built by ``python -m utils.recompress``.
+    """
+    folder_path = deck_dir.resolve().relative_to(REPO_ROOT).as_posix()
+    manifest = load_manifest(folder_path) or build_manifest(deck_dir)
+    wanted = set()
+    built = kept = 0
+    for entry in manifest["slides"]:
+        for width in [w for w in widths_for(entry["width"]) if w < entry["width"]]:
+            target = rendition_path(folder_path, entry["sha256"], width)
+            wanted.add(target)
+            if target.exists() and not force:
+                kept += 1
+                continue
+            _write(target, render_rendition((deck_dir / entry["name"]).read_bytes(), width))
+            built += 1
+    removed = 0
+    deck_static = STATIC_DIR / "lecture" / deck_dir.name
+    for stale in deck_static.glob("w*/*.webp"):
+        if stale not in wanted:
+            stale.unlink()
+            removed += 1
+    return built, kept, removed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-render multi-resolution slide renditions.")
+    parser.add_argument("decks", nargs="*", type=Path,
+                        help="deck folders (default: every deck under pages/lecture)")
+    parser.add_argument("--force", action="store_true", help="re-render renditions that already exist")
+    args = parser.parse_args(argv)
+
+    for deck in args.decks or deck_dirs():
+        built, kept, removed = build_renditions(deck, force=args.force)
+        print(f"renditions {deck.name}: {built} built, {kept} up to date, {removed} removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
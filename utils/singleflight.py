@@ -0,0 +1,105 @@
+"""Coalesce concurrent identical calls into one.
+
+When a whole class presses the same button at once, every session misses the
+cache for the same word or file at the same moment.  A ``Flight`` lets the
+first caller for a key run the call while the others wait for it and get the
+same result (or the same exception)::
+
+    from utils.singleflight import flight
+
+    TTS_FLIGHT = flight("tts")
+    data = TTS_FLIGHT.do(key, lambda: synthesize_uncached(...))
+
+Only calls that overlap are merged; nothing is kept once the call returns, so
+put a cache in front.  Flights are process-wide and registered by name;
+``stats()`` lists their counters for the admin view.
+"""
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class Flight:
+    """Thread-safe map of key -> in-flight call."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0        # every do()
+        self.executed = 0     # calls that ran fn
+        self.coalesced = 0    # calls that waited on another caller's fn
+        self.errors = 0       # executed calls that raised
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "in flight": len(self._calls),
+            }
+
+
+_flights: Dict[str, Flight] = {}
+_registry_lock = threading.Lock()
+
+
+def flight(name: str) -> Flight:
+    """The process-wide flight called ``name``, created on first use."""
+    with _registry_lock:
+        if name not in _flights:
+            _flights[name] = Flight(name)
+        return _flights[name]
+
+
+def stats() -> List[Dict]:
+    with _registry_lock:
+        flights = list(_flights.values())
+    return [{"flight": f.name, **f.stats()} for f in flights]
@@ -0,0 +1,276 @@
+"""Lecture slide player shared by the chapter pages.
+
+A chapter page only sets up its header and calls ``render_slide_player``::
+
+    render_slide_player("ch01")
+
+Decks are data: add an entry to ``DECKS`` (and build its manifest with
+``python -m utils.thumbnails``) instead of copying a page.  Session keys are
+prefixed with the deck key so the players do not share ``slide_idx`` etc.
+
+The slide (with its navigation) and the thumbnail grid are separate
+``st.fragment`` regions; only the sidebar display settings rerun the page.
+"""
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from utils.renditions import slide_image, slide_src, viewport_hint
+from utils.slides import discover_slides, neighbour_urls, prefetch_slides, preload_hints
+from utils.thumbnails import THUMB_MAX_W, thumbnail_bytes
+from utils.timing import cache_miss, timed
+
+# ------------ CONFIG ------------
+GITHUB_OWNER  = "MK316"
+GITHUB_REPO   = "english-phonetics"
+GITHUB_BRANCH = "main"
+
+THUMBS_PER_PAGE = 12
+THUMB_COLS      = 6
+CLIENT_SYNC_MS  = 1500
+
+# In-browser deck: slide flips are image swaps, the index is reported back only when it settles.
+_slide_deck = components.declare_component(
+    "slide_deck", path=str(Path(__file__).parent / "components" / "slide_deck")
+)
+
+
+@dataclass(frozen=True)
+class Deck:
+    key: str
+    folder_path: str
+    prefix: str
+    end_index: int
+    ext: str = ".png"
+    start_index: int = 1
+
+    @property
+    def raw_base(self) -> str:
+        return f"https://raw.githubusercontent.com/{GITHUB_OWNER}/{GITHUB_REPO}/{GITHUB_BRANCH}/{self.folder_path}"
+
+
+DECKS = {
+    "ch01": Deck("ch01", "pages/lecture/Ch01", "F25_Ch01.", end_index=120),
+    "ch02": Deck("ch02", "pages/lecture/Ch02", "F25_Ch02_only.", end_index=21),
+    "ch03": Deck("ch03", "pages/lecture/Ch03a", "Ch03a.", end_index=47),
+    "ch04": Deck("ch04", "pages/lecture/Ch04", "Ch4.", end_index=34),
+}
+
+
+# Reads pages/lecture/<deck>/manifest.json; only probes GitHub if it is missing.
+# One cache entry per deck, shared by every session in the process.
+@st.cache_data(show_spinner=False, ttl=3600)
+def load_deck(deck: Deck):
+    cache_miss()
+    return discover_slides(deck.raw_base, deck.folder_path, deck.prefix, deck.ext,
+                           deck.start_index, deck.end_index)
+
+
+def _key(deck: Deck, name: str) -> str:
+    return f"{deck.key}_{name}"
+
+
+def render_slide_player(deck_key: str) -> None:
+    deck = DECKS[deck_key]
+    with timed("slide discovery", cached=True, page=deck.key):
+        slides, _ = load_deck(deck)
+    if not slides:
+        st.error("⚠️ No PNG files found.")
+        st.stop()
+
+    def k(name: str) -> str:
+        return _key(deck, name)
+
+    ss = st.session_state
+
+    # ---- Session state init ----
+    ss.setdefault(k("slide_idx"), 0)
+    ss.setdefault(k("thumb_page"), 1)
+    ss.setdefault(k("fit_to_height"), True)
+    ss.setdefault(k("vh_percent"), 88)
+    ss.setdefault(k("display_width_px"), 1000)
+    ss.setdefault(k("client_nav"), True)
+
+    # ===== Sidebar: display settings (these rerun the whole page) =====
+    with st.sidebar:
+        st.subheader("Display")
+        st.toggle("⚡ Fast navigation (in browser)", key=k("client_nav"),
+                  help="Flip slides with the arrow keys or by clicking the slide, without reloading the page.")
+        st.toggle("Fit main slide to screen height", key=k("fit_to_height"))
+        if ss[k("fit_to_height")]:
+            st.slider("Height % of screen", 60, 95, key=k("vh_percent"))
+        else:
+            st.slider("Slide width (px)", 700, 1400, key=k("display_width_px"))
+
+    # Each region reruns on its own: flipping slides does not rebuild the
+    # thumbnail grid, paging thumbnails does not rebuild the slide.
+    _slide_view(deck, slides)
+    _thumbnail_grid(deck, slides)
+
+
+@st.fragment
+def _slide_view(deck: Deck, slides: List[str]) -> None:
+    with timed("slide view", page=deck.key):
+        _render_slide_view(deck, slides)
+
+
+def _render_slide_view(deck: Deck, slides: List[str]) -> None:
+    def k(name: str) -> str:
+        return _key(deck, name)
+
+    ss = st.session_state
+
+    # Position reported by the in-browser deck (applied once per report)
+    reported = ss.get(k("deck"))
+    if reported and reported.get("seq") != ss.get(k("deck_seq")):
+        ss[k("deck_seq")] = reported.get("seq")
+        ss[k("slide_idx")] = int(reported["index"]) % len(slides)
+
+    # --- Navigation callbacks ---
+    def go_prev():
+        ss[k("slide_idx")] = (ss[k("slide_idx")] - 1) % len(slides)
+
+    def go_next():
+        ss[k("slide_idx")] = (ss[k("slide_idx")] + 1) % len(slides)
+
+    def go_to_slide():
+        num = ss[k("slide_input")]
+        if 1 <= num <= len(slides):
+            ss[k("slide_idx")] = num - 1
+
+    # ===== Controls =====
+    nav = st.columns([1, 1, 2, 3], vertical_alignment="bottom")
+    with nav[0]:
+        st.button("◀️", use_container_width=True, on_click=go_prev, key=k("prev"))
+    with nav[1]:
+        st.button("▶️", use_container_width=True, on_click=go_next, key=k("next"))
+    with nav[2]:
+        st.markdown(
+            f"<div style='text-align:center; font-weight:600;'>{ss[k('slide_idx')] + 1} / {len(slides)}</div>",
+            unsafe_allow_html=True
+        )
+    with nav[3]:
+        st.number_input(
+            "Go to Slide #",
+            min_value=1,
+            max_value=len(slides),
+            step=1,
+            key=k("slide_input"),
+            on_change=go_to_slide
+        )
+
+    # ===== Main Slide =====
+    # Smallest pre-rendered width that fits the current display settings (utils.renditions)
+    idx = ss[k("slide_idx")]
+    fit_to_height = ss[k("fit_to_height")]
+    view = (fit_to_height, ss[k("vh_percent")], ss[k("display_width_px")], viewport_hint())
+    if ss[k("client_nav")]:
+        _slide_deck(
+            slides=_deck_srcs(deck, slides, idx, view),
+            index=idx,
+            vh_percent=ss[k("vh_percent")],
+            width_px=None if fit_to_height else ss[k("display_width_px")],
+            sync_ms=CLIENT_SYNC_MS,
+            key=k("deck"),
+            default=None,
+        )
+    elif fit_to_height:
+        st.markdown(
+            f"""
+            <div style="display:flex; justify-content:center;">
+                <img
+                    src="{slide_src(deck.folder_path, slides[idx], *view)}"
+                    alt="Slide {idx + 1}"
+                    style="
+                        max-height: {ss[k('vh_percent')]}vh;
+                        width: auto;
+                        height: auto;
+                        object-fit: contain;
+                        border: 1px solid #ccc;
+                        box-shadow: 2px 2px 6px rgba(0,0,0,0.1);
+                    "
+                />
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+        st.caption(f"Slide {idx + 1} / {len(slides)}")
+    else:
+        st.image(
+            slide_image(deck.folder_path, slides[idx], *view),
+            caption=f"Slide {idx + 1} / {len(slides)}",
+            width=ss[k("display_width_px")],
+            use_container_width=False
+        )
+
+    # ===== Prefetch neighbouring slides =====
+    # <img> mode: let the browser fetch them now; st.image mode: warm the server cache.
+    # (The in-browser deck preloads the whole deck itself.)
+    if not ss[k("client_nav")]:
+        upcoming = neighbour_urls(slides, idx)
+        if fit_to_height:
+            st.markdown(preload_hints([slide_src(deck.folder_path, u, *view) for u in upcoming]),
+                        unsafe_allow_html=True)
+        else:
+            prefetch_slides(upcoming, load=lambda u: slide_image(deck.folder_path, u, *view))
+
+
+def _deck_srcs(deck: Deck, slides: List[str], idx: int, view) -> List[str]:
+    """Every slide's <img> URL, resolved outward from ``idx``.
+
+    Missing renditions are queued in this order, so on a fresh deploy the
+    background builder does the slides around the current one first; until
+    then the deck shows the original PNGs.
+    """
+    total = len(slides)
+    srcs = [""] * total
+    for i in sorted(range(total), key=lambda i: min((i - idx) % total, (idx - i) % total)):
+        srcs[i] = slide_src(deck.folder_path, slides[i], *view)
+    return srcs
+
+
+@st.fragment
+def _thumbnail_grid(deck: Deck, slides: List[str]) -> None:
+    with timed("thumbnails", page=deck.key):
+        _render_thumbnail_grid(deck, slides)
+
+
+def _render_thumbnail_grid(deck: Deck, slides: List[str]) -> None:
+    def k(name: str) -> str:
+        return _key(deck, name)
+
+    ss = st.session_state
+
+    # ===== Thumbnails =====
+    with st.expander("📑 Thumbnails", expanded=False):
+        total = len(slides)
+        pages = max(1, math.ceil(total / THUMBS_PER_PAGE))
+
+        cols_top = st.columns(3)
+        with cols_top[0]:
+            st.caption(f"Total slides: {total}")
+        with cols_top[1]:
+            st.number_input("Thumbnail page", min_value=1, max_value=pages, step=1, key=k("thumb_page"))
+        with cols_top[2]:
+            st.caption(f"Page size: {THUMBS_PER_PAGE}")
+
+        start = (ss[k("thumb_page")] - 1) * THUMBS_PER_PAGE
+        end = min(start + THUMBS_PER_PAGE, total)
+        page_urls = slides[start:end]
+
+        cols = st.columns(min(THUMB_COLS, THUMBS_PER_PAGE))
+        for local_i, url in enumerate(page_urls):
+            global_idx = start + local_i
+            col = cols[local_i % len(cols)]
+            with col:
+                # Thumbnails are prebuilt (python -m utils.thumbnails) and shared by all sessions
+                thumb_bytes = thumbnail_bytes(deck.folder_path, url, THUMB_MAX_W)
+                if st.button(f"{global_idx + 1}", key=k(f"thumb_btn_{global_idx}"), use_container_width=True):
+                    # The slide lives in the other fragment: rerun the page to show it.
+                    ss[k("slide_idx")] = global_idx
+                    st.rerun()
+                st.image(thumb_bytes, width=150)
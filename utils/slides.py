@@ -0,0 +1,257 @@
+"""Slide deck helpers shared by the chapter players.
+
+Each deck folder under ``pages/lecture`` carries a ``manifest.json`` listing its
+slides (name, byte size, pixel size, sha256).  The players read the manifest
+instead of probing GitHub for every possible slide index.
+
+Rebuild the manifests after adding or replacing slides::
+
+    python -m utils.slides            # every deck under pages/lecture
+    python -m utils.slides --check    # exit 1 if any manifest is stale
+"""
+import argparse
+import hashlib
+import html
+import io
+import json
+import re
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from utils import http
+from utils.assets import asset_bytes
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+LECTURE_DIR = REPO_ROOT / "pages" / "lecture"
+MANIFEST_NAME = "manifest.json"
+SLIDE_EXTS = (".png", ".jpg", ".jpeg")
+
+# Fallback probing (decks without a manifest)
+PROBE_WORKERS = 16
+PROBE_MAX_MISSES = 8
+
+# Background warming of the slides around the current one
+PREFETCH_RADIUS = 2
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="slide-prefetch")
+_prefetch_lock = threading.Lock()
+_prefetching: Set[str] = set()
+
+_DIGIT_RUNS = re.compile(r"(\d+)")
+
+
+def natural_key(s: str):
+    # split() alternates text and digit runs: text at even indices, numbers at odd
+    parts = _DIGIT_RUNS.split(s.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
+# ---------------- Manifest build ----------------
+def slide_files(deck_dir: Path) -> List[Path]:
+    files = [p for p in deck_dir.iterdir() if p.is_file() and p.suffix.lower() in SLIDE_EXTS]
+    return sorted(files, key=lambda p: natural_key(p.name))
+
+
+def build_manifest(deck_dir: Path) -> Dict:
+    from PIL import Image
+
+    slides = []
+    for path in slide_files(deck_dir):
+        data = path.read_bytes()
+        with Image.open(io.BytesIO(data)) as im:
+            width, height = im.size
+        slides.append({
+            "name": path.name,
+            "bytes": len(data),
+            "width": width,
+            "height": height,
+            "sha256": hashlib.sha256(data).hexdigest(),
+        })
+    manifest = {
+        "folder": deck_dir.resolve().relative_to(REPO_ROOT).as_posix(),
+        "slides": slides,
+    }
+    # Page fingerprints written by utils.ingest survive a rebuild.
+    try:
+        previous = json.loads((deck_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    if "source" in previous:
+        manifest["source"] = previous["source"]
+    return manifest
+
+
+def manifest_text(manifest: Dict) -> str:
+    return json.dumps(manifest, indent=1, ensure_ascii=False) + "\n"
+
+
+def write_manifest(deck_dir: Path, manifest: Optional[Dict] = None) -> Path:
+    manifest = manifest if manifest is not None else build_manifest(deck_dir)
+    out = deck_dir / MANIFEST_NAME
+    out.write_text(manifest_text(manifest), encoding="utf-8")
+    return out
+
+
+def deck_dirs(root: Path = LECTURE_DIR) -> List[Path]:
+    return sorted(
+        (d for d in root.iterdir() if d.is_dir() and slide_files(d)),
+        key=lambda d: natural_key(d.name),
+    )
+
+
+# ---------------- Manifest load ----------------
+@lru_cache(maxsize=32)
+def _read_manifest(path: str, mtime_ns: int) -> Dict:
+    manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+    manifest["_by_name"] = {e["name"]: e for e in manifest.get("slides", [])}
+    return manifest
+
+
+def load_manifest(folder_path: str) -> Optional[Dict]:
+    """Return the manifest for a repo-relative deck folder, or None if absent."""
+    path = REPO_ROOT / folder_path / MANIFEST_NAME
+    try:
+        return _read_manifest(str(path), path.stat().st_mtime_ns)
+    except (OSError, ValueError):
+        return None
+
+
+def manifest_entry(folder_path: str, name: str) -> Optional[Dict]:
+    manifest = load_manifest(folder_path)
+    return manifest["_by_name"].get(name) if manifest else None
+
+
+def _slide_index(name: str, prefix: str, ext: str) -> Optional[int]:
+    if not (name.startswith(prefix) and name.endswith(ext)):
+        return None
+    middle = name[len(prefix):len(name) - len(ext)]
+    return int(middle) if middle.isdigit() else None
+
+
+def manifest_slides(manifest: Dict, prefix: str, ext: str, start_i: int, end_i: int) -> List[Dict]:
+    """Manifest entries matching ``{prefix}NNN{ext}`` with start_i <= NNN <= end_i."""
+    picked = []
+    for entry in manifest.get("slides", []):
+        i = _slide_index(entry["name"], prefix, ext)
+        if i is not None and start_i <= i <= end_i:
+            picked.append(entry)
+    return sorted(picked, key=lambda e: natural_key(e["name"]))
+
+
+# ---------------- Discovery ----------------
+def probe_pngs_by_pattern(raw_base: str, prefix: str, ext: str, start_i: int, end_i: int,
+                          workers: int = PROBE_WORKERS,
+                          max_misses: Optional[int] = PROBE_MAX_MISSES) -> List[str]:
+    """Fallback for decks without a manifest: HEAD each index on the server.
+
+    Up to ``workers`` requests are in flight at once and results are consumed
+    in index order, so probing stops as soon as ``max_misses`` consecutive
+    indices are missing (``None`` probes the whole range).
+    """
+    found = []
+    misses = 0
+    next_i = start_i
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while True:
+            while next_i <= end_i and len(pending) < max(1, workers):
+                name = f"{prefix}{next_i:03d}{ext}"
+                pending.append((name, pool.submit(http.exists, f"{raw_base}/{name}")))
+                next_i += 1
+            if not pending:
+                break
+            name, future = pending.popleft()
+            if future.result():
+                found.append(name)
+                misses = 0
+            else:
+                misses += 1
+                if max_misses is not None and misses >= max_misses:
+                    break
+        for _, future in pending:
+            future.cancel()
+    return sorted(found, key=natural_key)
+
+
+def discover_slides(raw_base: str, folder_path: str, prefix: str, ext: str,
+                    start_i: int, end_i: int) -> Tuple[List[str], List[str]]:
+    """Return (urls, filenames) for a deck, from its manifest when one exists."""
+    manifest = load_manifest(folder_path)
+    if manifest is not None:
+        names = [e["name"] for e in manifest_slides(manifest, prefix, ext, start_i, end_i)]
+    else:
+        names = probe_pngs_by_pattern(raw_base, prefix, ext, start_i, end_i)
+    return [f"{raw_base}/{n}" for n in names], names
+
+
+# ---------------- Prefetch ----------------
+def neighbour_urls(urls: List[str], idx: int, radius: int = PREFETCH_RADIUS) -> List[str]:
+    """Slides around ``idx`` in likely visiting order: next, previous, next+1, ..."""
+    total = len(urls)
+    picked: List[int] = []
+    for step in range(1, radius + 1):
+        for i in ((idx + step) % total, (idx - step) % total):
+            if i != idx and i not in picked:
+                picked.append(i)
+    return [urls[i] for i in picked]
+
+
+def _warm(url: str, load: Callable[[str], object]) -> None:
+    try:
+        load(url)
+    except Exception:
+        pass
+    finally:
+        with _prefetch_lock:
+            _prefetching.discard(url)
+
+
+def prefetch_slides(urls: List[str], load: Callable[[str], object] = asset_bytes) -> None:
+    """Run ``load(url)`` for each slide in the background to warm the shared caches."""
+    for url in urls:
+        with _prefetch_lock:
+            if url in _prefetching:
+                continue
+            _prefetching.add(url)
+        _prefetch_pool.submit(_warm, url, load)
+
+
+def preload_hints(urls: List[str]) -> str:
+    """<link rel=preload> tags so the browser fetches upcoming <img> slides early."""
+    return "".join(f'<link rel="preload" as="image" href="{html.escape(u)}">' for u in urls)
+
+
+# ---------------- CLI ----------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build slide manifests for lecture decks.")
+    parser.add_argument("decks", nargs="*", type=Path,
+                        help="deck folders (default: every deck under pages/lecture)")
+    parser.add_argument("--check", action="store_true",
+                        help="do not write; exit 1 if any manifest is missing or stale")
+    args = parser.parse_args(argv)
+
+    stale = 0
+    for deck in args.decks or deck_dirs():
+        manifest = build_manifest(deck)
+        target = deck / MANIFEST_NAME
+        current = target.read_text(encoding="utf-8") if target.exists() else None
+        if current == manifest_text(manifest):
+            print(f"ok       {deck} ({len(manifest['slides'])} slides)")
+            continue
+        if args.check:
+            stale += 1
+            print(f"stale    {deck}")
+        else:
+            write_manifest(deck, manifest)
+            print(f"written  {target} ({len(manifest['slides'])} slides)")
+    return 1 if stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
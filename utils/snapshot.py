@@ -0,0 +1,155 @@
+"""Bundle every remote file the pages depend on, for running without network.
+
+    python -m utils.snapshot             # crawl the pages, download, write snapshot/index.json
+    python -m utils.snapshot --list      # only show what would be bundled
+
+The crawler reads ``HOME.py`` and ``pages/**/*.py`` with ``ast`` and collects
+URL string literals (f-strings built from string constants too, such as the
+Google Sheet export URL), keeping those that point at data or media files.
+Repo-owned URLs are skipped: they are already served from the checkout.
+``EXTRA_URLS`` lists anything the pages do not spell out.
+
+The bundle is ``snapshot/files/<sha256(url)[:16]><ext>`` plus ``index.json``
+mapping URL -> file.  Start the app with ``PHONETICS_OFFLINE=1`` to serve
+from it (see ``utils.http``); commit the folder if the deployment needs it.
+"""
+import argparse
+import ast
+import hashlib
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+from urllib.parse import urlsplit
+
+from utils import http
+from utils.assets import local_path, to_raw
+
+PAGE_GLOBS = ("HOME.py", "pages/**/*.py")
+ASSET_EXTS = {".csv", ".tsv", ".txt", ".json", ".xlsx",
+              ".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg",
+              ".mp3", ".wav", ".ogg", ".m4a"}
+EXTRA_URLS: List[str] = []
+
+_URL_RE = re.compile(r"https?://[^\s\"'<>()\[\]]+")
+
+
+# ---------------- Crawl ----------------
+def _string_constants(tree: ast.AST) -> Dict[str, str]:
+    consts = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) \
+                and isinstance(node.value.value, str):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    consts[target.id] = node.value.value
+    return consts
+
+
+def _strings(tree: ast.AST, consts: Dict[str, str]) -> Iterable[str]:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield node.value
+        elif isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.Constant):
+                    parts.append(str(value.value))
+                elif isinstance(value.value, ast.Name) and value.value.id in consts:
+                    parts.append(consts[value.value.id])
+                else:
+                    break
+            else:
+                yield "".join(parts)
+
+
+def is_asset_url(url: str) -> bool:
+    parts = urlsplit(url)
+    if "docs.google.com" in parts.netloc and "format=csv" in parts.query:
+        return True
+    return Path(parts.path).suffix.lower() in ASSET_EXTS
+
+
+def crawl(root: Path = http.REPO_ROOT) -> Dict[str, Set[str]]:
+    """Remote asset URLs used by the pages -> the files that mention them."""
+    found: Dict[str, Set[str]] = {}
+    files = sorted({p for pattern in PAGE_GLOBS for p in root.glob(pattern)})
+    for path in files:
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        consts = _string_constants(tree)
+        for text in _strings(tree, consts):
+            for url in _URL_RE.findall(text):
+                url = url.rstrip(".,;")
+                if is_asset_url(url) and local_path(url) is None:
+                    found.setdefault(url, set()).add(path.relative_to(root).as_posix())
+    for url in EXTRA_URLS:
+        found.setdefault(url, set()).add("utils/snapshot.py")
+    return found
+
+
+# ---------------- Bundle ----------------
+def bundle_name(url: str, content_type: str = "") -> str:
+    ext = Path(urlsplit(url).path).suffix.lower()
+    if ext not in ASSET_EXTS:
+        ext = ".csv" if "csv" in content_type or "format=csv" in url else ".bin"
+    return f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}{ext}"
+
+
+def build_snapshot(urls: Dict[str, Set[str]], out_dir: Path = http.SNAPSHOT_DIR) -> List[str]:
+    """Download ``urls`` into ``out_dir`` and write its index; returns the URLs that failed."""
+    index_path = out_dir / http.SNAPSHOT_INDEX
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8")).get("urls", {})
+    except (OSError, ValueError):
+        index = {}
+    failed = []
+    for url, sources in sorted(urls.items()):
+        try:
+            r = http.session().get(url, timeout=http.TIMEOUT)
+            r.raise_for_status()
+        except Exception as e:
+            # keep the previous copy, if any
+            print(f"  FAILED {url}: {e}")
+            failed.append(url)
+            continue
+        entry = {
+            "file": f"files/{bundle_name(url, r.headers.get('Content-Type', ''))}",
+            "bytes": len(r.content),
+            "sha256": hashlib.sha256(r.content).hexdigest(),
+            "content_type": r.headers.get("Content-Type", ""),
+            "sources": sorted(sources),
+        }
+        http._atomic_write(out_dir / entry["file"], r.content)
+        index[url] = entry
+        if to_raw(url) != url:
+            index[to_raw(url)] = entry
+        print(f"  {entry['bytes']:>9,d} B  {url}")
+    doc = {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "urls": index}
+    http._atomic_write(index_path, (json.dumps(doc, indent=1, sort_keys=True) + "\n").encode("utf-8"))
+    return failed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bundle the app's remote assets for offline use.")
+    parser.add_argument("--out", type=Path, default=http.SNAPSHOT_DIR, help="bundle folder (default: snapshot/)")
+    parser.add_argument("--list", action="store_true", help="print the URLs and exit")
+    args = parser.parse_args(argv)
+
+    urls = crawl()
+    if args.list:
+        for url, sources in sorted(urls.items()):
+            print(f"{url}\n    <- {', '.join(sorted(sources))}")
+        return 0
+    print(f"snapshot {args.out}: {len(urls)} remote URLs")
+    failed = build_snapshot(urls, args.out)
+    print(f"snapshot {args.out}: {len(urls) - len(failed)} bundled, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Pre-rendered slide thumbnails.
+
+Thumbnails are stored next to their deck as ``thumbs/<sha256[:16]>.webp``,
+named after the content hash recorded in the deck manifest.  A slide whose
+bytes change gets a new hash, so only that thumbnail is re-rendered; files no
+longer referenced by the manifest are removed.
+
+    python -m utils.thumbnails            # refresh manifests + thumbnails
+    python -m utils.thumbnails --force    # re-render everything
+"""
+import argparse
+import io
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from utils.assets import asset_bytes
+from utils.cache import ByteLRU
+from utils.slides import (
+    MANIFEST_NAME,
+    REPO_ROOT,
+    build_manifest,
+    deck_dirs,
+    manifest_entry,
+    manifest_text,
+    write_manifest,
+)
+
+THUMB_DIR = "thumbs"
+THUMB_MAX_W = 160
+THUMB_CACHE_BYTES = 16 * 1024 * 1024
+
+# One store per process; sessions look thumbnails up here instead of keeping copies.
+THUMB_STORE = ByteLRU(THUMB_CACHE_BYTES)
+
+
+def render_thumbnail(raw: bytes, max_w: int = THUMB_MAX_W) -> bytes:
+    from PIL import Image
+
+    im = Image.open(io.BytesIO(raw)).convert("RGBA")
+    w, h = im.size
+    if w > max_w:
+        new_h = int(h * (max_w / w))
+        im = im.resize((max_w, new_h), Image.LANCZOS)
+    if im.mode in ("RGBA", "LA"):
+        bg = Image.new("RGB", im.size, (255, 255, 255))
+        bg.paste(im, mask=im.split()[-1])
+        im = bg
+    else:
+        im = im.convert("RGB")
+    buf = io.BytesIO()
+    im.save(buf, format="WEBP", quality=80, method=6)
+    return buf.getvalue()
+
+
+def thumb_name(sha256: str) -> str:
+    return f"{sha256[:16]}.webp"
+
+
+def prebuilt_thumbnail(folder_path: str, name: str) -> Optional[bytes]:
+    """Thumbnail bytes for slide ``name`` of a deck, if the build step made one."""
+    entry = manifest_entry(folder_path, name)
+    if entry is None:
+        return None
+    path = REPO_ROOT / folder_path / THUMB_DIR / thumb_name(entry["sha256"])
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def thumbnail_bytes(folder_path: str, url: str, max_w: int = THUMB_MAX_W) -> bytes:
+    """Thumbnail for a slide URL via the shared store: prebuilt file, else rendered."""
+    name = url.rsplit("/", 1)[-1]
+
+    def load() -> bytes:
+        prebuilt = prebuilt_thumbnail(folder_path, name)
+        if prebuilt is not None:
+            return prebuilt
+        return render_thumbnail(asset_bytes(url), max_w)
+
+    return THUMB_STORE.get_or_load((folder_path, name, max_w), load)
+
+
+def build_thumbnails(deck_dir: Path, manifest: Dict, force: bool = False) -> Tuple[int, int, int]:
+    """Render missing thumbnails for a deck; returns (built, kept, removed)."""
+    out_dir = deck_dir / THUMB_DIR
+    out_dir.mkdir(exist_ok=True)
+    wanted = set()
+    built = kept = 0
+    for entry in manifest["slides"]:
+        target = out_dir / thumb_name(entry["sha256"])
+        wanted.add(target.name)
+        if target.exists() and not force:
+            kept += 1
+            continue
+        target.write_bytes(render_thumbnail((deck_dir / entry["name"]).read_bytes()))
+        built += 1
+    removed = 0
+    for stale in out_dir.glob("*.webp"):
+        if stale.name not in wanted:
+            stale.unlink()
+            removed += 1
+    return built, kept, removed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-render slide thumbnails for lecture decks.")
+    parser.add_argument("decks", nargs="*", type=Path,
+                        help="deck folders (default: every deck under pages/lecture)")
+    parser.add_argument("--force", action="store_true", help="re-render thumbnails that already exist")
+    args = parser.parse_args(argv)
+
+    for deck in args.decks or deck_dirs():
+        manifest = build_manifest(deck)
+        target = deck / MANIFEST_NAME
+        if not target.exists() or target.read_text(encoding="utf-8") != manifest_text(manifest):
+            write_manifest(deck, manifest)
+            print(f"manifest {target}")
+        built, kept, removed = build_thumbnails(deck, manifest, force=args.force)
+        print(f"thumbs   {deck}: {built} built, {kept} up to date, {removed} removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Section timings for the pages, written to a rotating JSON-lines log.
+
+Wrap the logical sections of a page (loading, synthesis, plotting, PDF
+build, ...)::
+
+    from utils.timing import cache_miss, timed
+
+    with timed("load audio", cached=True):
+        y, sr = load_audio(url)        # the cached function calls cache_miss()
+
+Each record holds the page (the calling script's file name), section,
+duration, cache hit/miss (for ``cached=True`` sections: "hit" unless
+``cache_miss()`` ran inside) and the Streamlit session id.  Records go to
+``logs/timing.jsonl`` (``PHONETICS_LOG_DIR`` to move it), rotated at 1 MB.
+``summary()`` gives p50/p95 per section for the admin view.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+LOG_DIR = Path(os.environ.get("PHONETICS_LOG_DIR", REPO_ROOT / "logs"))
+LOG_FILE = "timing.jsonl"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+_UTILS_DIR = str(Path(__file__).resolve().parent)
+_logger = logging.getLogger("phonetics.timing")
+_logger_lock = threading.Lock()
+_open = threading.local()
+
+
+def _log() -> logging.Logger:
+    if not _logger.handlers:
+        with _logger_lock:
+            if not _logger.handlers:
+                LOG_DIR.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(LOG_DIR / LOG_FILE, maxBytes=LOG_MAX_BYTES,
+                                              backupCount=LOG_BACKUPS, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                _logger.addHandler(handler)
+                _logger.setLevel(logging.INFO)
+                _logger.propagate = False
+    return _logger
+
+
+def _page_name() -> str:
+    """File name of the page script that called into us."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.startswith(_UTILS_DIR) and "contextlib" not in filename:
+            return Path(filename).stem
+        frame = frame.f_back
+    return "?"
+
+
+def _session_id() -> Optional[str]:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx(suppress_warning=True)
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+
+def cache_miss() -> None:
+    """Mark the innermost open section on this thread as a cache miss."""
+    stack = getattr(_open, "stack", None)
+    if stack:
+        stack[-1]["cache"] = "miss"
+
+
+@contextmanager
+def timed(section: str, cached: bool = False, page: Optional[str] = None) -> Iterator[Dict]:
+    record = {
+        "page": page or _page_name(),
+        "section": section,
+        "cache": "hit" if cached else None,
+        "session": _session_id(),
+    }
+    stack = _open.__dict__.setdefault("stack", [])
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        record["ts"] = round(time.time(), 3)
+        stack.pop()
+        try:
+            _log().info(json.dumps(record, ensure_ascii=False))
+        except OSError:
+            pass
+
+
+# ---------------- Reading ----------------
+def load_records(log_dir: Path = LOG_DIR) -> List[Dict]:
+    """Every record in the current and rotated log files, oldest first."""
+    files = [log_dir / f"{LOG_FILE}.{i}" for i in range(LOG_BACKUPS, 0, -1)] + [log_dir / LOG_FILE]
+    records = []
+    for path in files:
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def summary(records: List[Dict]) -> List[Dict]:
+    """count / p50 / p95 / max / cache hit rate per (page, section), slowest p95 first."""
+    groups: Dict[tuple, List[Dict]] = {}
+    for r in records:
+        groups.setdefault((r.get("page"), r.get("section")), []).append(r)
+    rows = []
+    for (page, section), group in groups.items():
+        ms = [r["ms"] for r in group]
+        cached = [r for r in group if r.get("cache")]
+        rows.append({
+            "page": page,
+            "section": section,
+            "count": len(group),
+            "p50 ms": percentile(ms, 50),
+            "p95 ms": percentile(ms, 95),
+            "max ms": max(ms),
+            "hit rate": (sum(r["cache"] == "hit" for r in cached) / len(cached)) if cached else None,
+            "sessions": len({r.get("session") for r in group}),
+        })
+    return sorted(rows, key=lambda row: -row["p95 ms"])
@@ -0,0 +1,231 @@
+"""Text-to-speech with a persistent, content-addressed MP3 cache.
+
+Every page synthesizes through here, so a word is sent to Google once::
+
+    from utils import tts
+
+    with timed("tts", cached=True):
+        mp3 = tts.synthesize("phonetics")                  # en, com, normal speed
+        mp3 = tts.synthesize(text, lang="en", tld="co.uk")
+        clips = tts.synthesize_many(["butter", "better"])  # concurrent, in order
+
+    for i, mp3 in tts.synthesize_iter(texts):            # (index, clip) as each is ready
+        slots[i].audio(mp3, format="audio/mp3")
+
+    chunks = tts.split_sentences(passage)                # long text: one clip per sentence
+    mp3 = tts.join(tts.synthesize_many(chunks))
+
+Clips are keyed by ``(text, lang, tld, slow)`` and stored as
+``.cache/tts/<sha256>.mp3`` (``PHONETICS_TTS_DIR`` to move it), so they
+survive restarts and are shared by all sessions and worker processes.  The
+folder is kept under ``TTS_CACHE_MB`` (``PHONETICS_TTS_CACHE_MB``) by
+deleting the least recently used clips; recently played clips are also held
+in memory.  A synthesis (cache miss) calls ``utils.timing.cache_miss()``;
+concurrent misses for the same clip wait on a single request
+(``utils.singleflight``).
+
+Lists are synthesized on a process-wide pool of ``TTS_WORKERS``
+(``PHONETICS_TTS_WORKERS``) threads, so a page with 20 uncached items waits
+about as long as its slowest one, and all sessions together never have more
+than ``TTS_WORKERS`` requests open to Google.  Long passages are split into
+sentences first: each is cached on its own, so editing one sentence
+re-synthesizes only that one, and MP3 clips concatenate into one stream.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from utils import http
+from utils.cache import ByteLRU
+from utils.singleflight import flight
+from utils.timing import cache_miss
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TTS_DIR = Path(os.environ.get("PHONETICS_TTS_DIR", REPO_ROOT / ".cache" / "tts"))
+TTS_CACHE_MB = float(os.environ.get("PHONETICS_TTS_CACHE_MB", 256))
+TTS_WORKERS = int(os.environ.get("PHONETICS_TTS_WORKERS", 20))
+TTS_MEMORY_BYTES = 16 * 1024 * 1024
+DEFAULT_TLD = "com"
+CHUNK_CHARS = 200  # longer sentences are cut at a comma or space
+
+log = logging.getLogger("phonetics.tts")
+
+# Recently played clips, shared by all sessions in the process.
+TTS_STORE = ByteLRU(TTS_MEMORY_BYTES)
+TTS_FLIGHT = flight("tts")
+
+_dir_lock = threading.Lock()
+_dir_bytes: Optional[int] = None  # running total of TTS_DIR, scanned on first write
+_SENTENCE_BREAK = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'”’)\]]))\s+|(?<=[。！？])")
+_CLAUSE_BREAKS = (", ", "; ", ": ", "，", "、", " ")
+_pool_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def cache_key(text: str, lang: str = "en", tld: Optional[str] = DEFAULT_TLD, slow: bool = False) -> str:
+    payload = json.dumps([text.strip(), lang, tld or DEFAULT_TLD, bool(slow)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def clip_path(key: str) -> Path:
+    return TTS_DIR / f"{key}.mp3"
+
+
+def _gtts(text: str, lang: str, tld: str, slow: bool) -> bytes:
+    from gtts import gTTS
+
+    buf = io.BytesIO()
+    gTTS(text=text, lang=lang, tld=tld, slow=slow).write_to_fp(buf)
+    return buf.getvalue()
+
+
+def _read_clip(key: str) -> Optional[bytes]:
+    path = clip_path(key)
+    try:
+        data = path.read_bytes()
+        os.utime(path)  # mtime doubles as last use, for eviction
+        return data
+    except OSError:
+        return None
+
+
+def _write_clip(key: str, data: bytes) -> None:
+    global _dir_bytes
+    try:
+        http._atomic_write(clip_path(key), data)
+    except OSError as e:
+        log.warning("tts cache: could not write %s: %s", key, e)
+        return
+    with _dir_lock:
+        if _dir_bytes is None:
+            _dir_bytes = sum(p.stat().st_size for p in TTS_DIR.glob("*.mp3"))
+        else:
+            _dir_bytes += len(data)
+        if _dir_bytes > TTS_CACHE_MB * 2**20:
+            _dir_bytes = evict()
+
+
+def evict(max_bytes: Optional[float] = None) -> int:
+    """Delete least recently used clips until the folder fits ``max_bytes``; returns its new size."""
+    max_bytes = TTS_CACHE_MB * 2**20 if max_bytes is None else max_bytes
+    clips = []
+    for path in TTS_DIR.glob("*.mp3"):
+        try:
+            info = path.stat()
+        except OSError:
+            continue
+        clips.append((info.st_mtime, info.st_size, path))
+    total = sum(size for _, size, _ in clips)
+    # go down to 90% so the next few writes do not trigger another scan
+    target = max_bytes * 0.9
+    for _, size, path in sorted(clips, key=lambda c: c[0]):
+        if total <= target:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+def cached(text: str, lang: str = "en", tld: Optional[str] = DEFAULT_TLD, slow: bool = False) -> Optional[bytes]:
+    """The clip if it is already in memory or on disk, without synthesizing."""
+    key = cache_key(text, lang, tld, slow)
+    data = TTS_STORE.get(key)
+    if data is None:
+        data = _read_clip(key)
+        if data is not None:
+            TTS_STORE.put(key, data)
+    return data
+
+
+def synthesize(text: str, lang: str = "en", tld: Optional[str] = DEFAULT_TLD, slow: bool = False) -> bytes:
+    """MP3 bytes for ``text``: from memory, then disk, else from gTTS (and stored)."""
+    data = cached(text, lang, tld, slow)
+    if data is None:
+        cache_miss()
+        key = cache_key(text, lang, tld, slow)
+        # sessions asking for the same clip at once share one request to Google
+        data = TTS_FLIGHT.do(key, lambda: _synthesize(key, text.strip(), lang, tld or DEFAULT_TLD, slow))
+    return data
+
+
+def _synthesize(key: str, text: str, lang: str, tld: str, slow: bool) -> bytes:
+    data = cached(text, lang, tld, slow)  # a flight for this key may have just finished
+    if data is None:
+        data = _gtts(text, lang, tld, slow)
+        TTS_STORE.put(key, data)
+        _write_clip(key, data)
+    return data
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+        return _pool
+
+
+def synthesize_iter(texts: Iterable[str], lang: str = "en", tld: Optional[str] = DEFAULT_TLD,
+                    slow: bool = False) -> Iterator[Tuple[int, bytes]]:
+    """``(index, clip)`` for each of ``texts`` as soon as it is ready: cached clips first, in
+    order, then syntheses as they complete.  The first failed synthesis is raised."""
+    texts = list(texts)
+    pending = {}
+    for i, text in enumerate(texts):
+        data = cached(text, lang, tld, slow)
+        if data is None:
+            pending[i] = text
+        else:
+            yield i, data
+    if not pending:
+        return
+    cache_miss()  # timing sections are per thread, so mark the caller's section here
+    pool = _executor()
+    futures = {pool.submit(synthesize, text, lang, tld, slow): i for i, text in pending.items()}
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def synthesize_many(texts: Iterable[str], lang: str = "en", tld: Optional[str] = DEFAULT_TLD,
+                    slow: bool = False) -> List[bytes]:
+    """Clips for ``texts``, in order, synthesized concurrently."""
+    texts = list(texts)
+    clips: List[Optional[bytes]] = [None] * len(texts)
+    for i, data in synthesize_iter(texts, lang, tld, slow):
+        clips[i] = data
+    return clips
+
+
+def split_sentences(text: str, max_chars: int = CHUNK_CHARS) -> List[str]:
+    """``text`` cut at sentence ends (and long sentences at clause breaks), for per-chunk caching."""
+    chunks = []
+    for sentence in _SENTENCE_BREAK.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = max(sentence.rfind(sep, 0, max_chars) for sep in _CLAUSE_BREAKS) + 1
+            if cut <= 1:
+                cut = max_chars
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+
+def join(clips: Iterable[bytes]) -> bytes:
+    """One playable MP3 from consecutive clips (MP3 frames simply concatenate, as gTTS does itself)."""
+    return b"".join(clips)
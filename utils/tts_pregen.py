@@ -0,0 +1,178 @@
+"""Pre-synthesize every text the pages speak into the TTS cache.
+
+    python -m utils.tts_pregen                 # synthesize what is missing, then report
+    python -m utils.tts_pregen --check         # coverage report only; exit 1 if anything is missing
+    python -m utils.tts_pregen --workers 4 --rate 2
+
+Sources:
+
+* ``CSV_SOURCES``: a column of a CSV, by repo glob or URL (the IPA word
+  lists, the Ch1 glossary descriptions).
+* Pages: module-level lists named in ``DECLARED_NAMES`` (e.g.
+  ``PRACTICE_ITEMS`` in 23 Transcription2) and string literals passed
+  straight to ``tts.synthesize``, found with ``ast``.
+
+Everything is synthesized with the defaults the pages use (``en``, ``com``,
+normal speed).  Requests go through a bounded pool and a rate limit so a
+full run does not get the server throttled by Google.
+"""
+import argparse
+import ast
+import csv
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from utils import tts
+from utils.assets import asset_bytes
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PAGE_GLOBS = ("pages/*.py", "pages/apps/*.py")
+CSV_SOURCES: List[Tuple[str, str, str]] = [
+    # (label, repo glob or URL, column)
+    ("IPA word lists", "pages/data/IPAdata*.csv", "Word"),
+    ("Ch1 glossary", "https://raw.githubusercontent.com/MK316/classmaterial/main/Phonetics/ch01_glossary_0915.csv",
+     "Description"),
+]
+DECLARED_NAMES = ("PRACTICE_ITEMS", "TTS_TEXTS")
+WORKERS = 4
+RATE = 2.0  # requests per second
+
+
+# ---------------- Sources ----------------
+def _csv_column(data: bytes, column: str) -> List[str]:
+    rows = csv.DictReader(io.StringIO(data.decode("utf-8-sig")))
+    return [row[column] for row in rows if (row.get(column) or "").strip()]
+
+
+def csv_texts(spec: str, column: str) -> List[str]:
+    if spec.startswith(("http://", "https://")):
+        return _csv_column(asset_bytes(spec), column)
+    texts = []
+    for path in sorted(REPO_ROOT.glob(spec)):
+        texts += _csv_column(path.read_bytes(), column)
+    return texts
+
+
+def _is_synthesize_call(node: ast.AST) -> bool:
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "synthesize" and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "tts")
+
+
+def page_texts(path: Path) -> List[str]:
+    """Texts a page declares: ``DECLARED_NAMES`` lists and literal ``tts.synthesize`` arguments."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    texts = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, (ast.List, ast.Tuple)) and any(
+                isinstance(t, ast.Name) and t.id in DECLARED_NAMES for t in node.targets):
+            texts += [e.value for e in node.value.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+    for node in ast.walk(tree):
+        if _is_synthesize_call(node) and node.args and isinstance(node.args[0], ast.Constant) \
+                and isinstance(node.args[0].value, str):
+            texts.append(node.args[0].value)
+    return texts
+
+
+def collect() -> Dict[str, List[str]]:
+    """Source label -> unique texts, in first-seen order."""
+    sources: Dict[str, List[str]] = {}
+    for label, spec, column in CSV_SOURCES:
+        try:
+            sources[label] = csv_texts(spec, column)
+        except Exception as e:  # an unreachable remote list should not stop the rest
+            print(f"  skipped {label}: {e}")
+    for pattern in PAGE_GLOBS:
+        for path in sorted(REPO_ROOT.glob(pattern)):
+            texts = page_texts(path)
+            if texts:
+                sources[path.relative_to(REPO_ROOT).as_posix()] = texts
+    return {label: list(dict.fromkeys(t.strip() for t in texts if t.strip())) for label, texts in sources.items()}
+
+
+# ---------------- Synthesis ----------------
+class RateLimiter:
+    """At most ``rate`` acquisitions per second across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def is_cached(text: str) -> bool:
+    return tts.clip_path(tts.cache_key(text)).exists()
+
+
+def pregenerate(texts: List[str], workers: int = WORKERS, rate: float = RATE) -> Dict[str, str]:
+    """Synthesize ``texts`` into the cache; returns text -> error for the failures."""
+    limiter = RateLimiter(rate)
+    failed: Dict[str, str] = {}
+
+    def one(text: str) -> None:
+        limiter.wait()
+        tts.synthesize(text)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-pregen") as pool:
+        futures = {pool.submit(one, text): text for text in texts}
+        for done, future in enumerate(as_completed(futures), start=1):
+            text = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failed[text] = f"{type(e).__name__}: {e}"
+            if done % 25 == 0 or done == len(texts):
+                print(f"  {done}/{len(texts)} synthesized, {len(failed)} failed")
+    return failed
+
+
+def coverage(sources: Dict[str, List[str]], show: int) -> int:
+    """Print cached/missing per source; returns the number of missing texts."""
+    missing_total: Set[str] = set()
+    for label, texts in sources.items():
+        missing = [t for t in texts if not is_cached(t)]
+        missing_total.update(missing)
+        print(f"{len(texts) - len(missing):>6}/{len(texts):<6} cached  {label}")
+        for text in missing[:show]:
+            print(f"           missing: {text[:70]}")
+        if len(missing) > show:
+            print(f"           ... and {len(missing) - show} more")
+    return len(missing_total)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-synthesize the course texts into the TTS cache.")
+    parser.add_argument("--check", action="store_true", help="report coverage only; exit 1 if anything is missing")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"concurrent requests (default {WORKERS})")
+    parser.add_argument("--rate", type=float, default=RATE, help=f"requests per second (default {RATE:g})")
+    parser.add_argument("--show", type=int, default=10, help="missing texts to list per source")
+    args = parser.parse_args(argv)
+
+    sources = collect()
+    texts = list(dict.fromkeys(t for ts in sources.values() for t in ts))
+    todo = [t for t in texts if not is_cached(t)]
+    print(f"{len(texts)} texts from {len(sources)} sources, {len(todo)} not cached ({tts.TTS_DIR})")
+    if todo and not args.check:
+        failed = pregenerate(todo, args.workers, args.rate)
+        for text, error in list(failed.items())[:args.show]:
+            print(f"  FAILED {text[:60]!r}: {error}")
+    missing = coverage(sources, args.show)
+    print(f"{len(texts) - missing}/{len(texts)} texts cached")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())